@@ -67,7 +67,7 @@ class AgentConfig:
 class RunContext:
     run_id: str
     run_name: str
-    config_id: str
+    config_id: Optional[str]  # None once the run's config has been deleted
     gpu_indices: list[int]
     log_dir: str
     ckpt_dir: str
\ No newline at end of file
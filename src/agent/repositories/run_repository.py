@@ -3,13 +3,43 @@ from __future__ import annotations
 from datetime import datetime, timezone
 from typing import Optional
 
-from shared.database.connection import SessionLocal
+from sqlalchemy import bindparam, text, update
+
+from shared.database.connection import GUID, SessionLocal
 from shared.database import models
 
 from ..domain import RunContext
 from ..services.websocket_notifier import websocket_notifier
 
 
+# Single-statement dequeue for Postgres: lock the next job/run pair (skipping
+# rows a concurrent agent holds), then flip both in data-modifying CTEs so the
+# locks live for one round-trip. Timestamps are naive UTC like the ORM's.
+_DEQUEUE_SQL = text("""
+WITH next AS (
+    SELECT j.id AS job_id, r.id AS run_id
+    FROM jobs j
+    JOIN runs r ON j.run_id = r.id
+    WHERE r.state = 'queued' AND r.agent_id = :agent_id
+    ORDER BY j.priority DESC, j.enqueued_at ASC
+    LIMIT 1
+    FOR UPDATE OF j, r SKIP LOCKED
+), job AS (
+    UPDATE jobs
+    SET dequeued_at = timezone('utc', now()), updated_at = timezone('utc', now())
+    FROM next
+    WHERE jobs.id = next.job_id
+    RETURNING jobs.priority, jobs.enqueued_at
+)
+UPDATE runs
+SET state = 'running', started_at = timezone('utc', now()), updated_at = timezone('utc', now())
+FROM next, job
+WHERE runs.id = next.run_id
+RETURNING runs.id, runs.name, runs.config_id, runs.gpu_indices, runs.log_dir, runs.ckpt_dir,
+          job.priority, job.enqueued_at
+""").bindparams(bindparam("agent_id", type_=GUID()))  # canonical form, as the ORM stores it
+
+
 class RunRepository:
     """Repository for run-related database operations."""
 
@@ -24,7 +54,12 @@ class RunRepository:
             RunContext if a run is available, None otherwise
         """
         with self._db_factory() as db:
-            # Find next queued run by priority and enqueue time
+            if db.get_bind().dialect.name == "postgresql":
+                return self._dequeue_postgres(db, agent_id)
+
+            # Find next queued run by priority and enqueue time. Rows locked by a
+            # concurrent dequeue are skipped rather than waited on, and the lock
+            # is held until the state transition below commits.
             result = (
                 db.query(models.Job, models.Run)
                 .join(models.Run, models.Job.run_id == models.Run.id)
@@ -36,6 +71,7 @@ class RunRepository:
                     models.Job.priority.desc(),
                     models.Job.enqueued_at.asc()
                 )
+                .with_for_update(skip_locked=True)
                 .first()
             )
 
@@ -61,12 +97,33 @@ class RunRepository:
             return RunContext(
                 run_id=str(run.id),
                 run_name=run.name,
-                config_id=str(run.config_id),
+                config_id=str(run.config_id) if run.config_id else None,
                 gpu_indices=run.gpu_indices or [],
                 log_dir=run.log_dir,
                 ckpt_dir=run.ckpt_dir,
             )
 
+    def _dequeue_postgres(self, db, agent_id: str) -> Optional[RunContext]:
+        """Dequeue the next run with one UPDATE ... RETURNING statement."""
+        row = db.execute(_DEQUEUE_SQL, {"agent_id": agent_id}).mappings().first()
+        db.commit()
+        if row is None:
+            return None
+
+        print(
+            f"[repository] Dequeued run id={row['id']} name={row['name']} "
+            f"priority={row['priority']} queued_at={row['enqueued_at']}"
+        )
+
+        return RunContext(
+            run_id=str(row["id"]),
+            run_name=row["name"],
+            config_id=str(row["config_id"]) if row["config_id"] else None,
+            gpu_indices=row["gpu_indices"] or [],
+            log_dir=row["log_dir"],
+            ckpt_dir=row["ckpt_dir"],
+        )
+
     def update_run_epoch(self, run_id: str, epoch: int) -> bool:
         """Update the current epoch for a run."""
         with self._db_factory() as db:
@@ -80,6 +137,19 @@ class RunRepository:
 
             return True
 
+    def update_run_epochs(self, updates: list[dict]) -> None:
+        """
+        Apply several epoch updates in one executemany round-trip.
+
+        Args:
+            updates: Dicts with the run primary key under "id" and the new "epoch"
+        """
+        if not updates:
+            return
+        with self._db_factory() as db:
+            db.execute(update(models.Run), updates)
+            db.commit()
+
     def mark_run_canceled(self, run_id: str) -> bool:
         """Mark a run as canceled."""
         return self._update_run_state(run_id, "canceled")
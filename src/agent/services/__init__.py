@@ -1,9 +1,11 @@
 from .gpu_discovery import GPUDiscoveryService
 from .training_executor import TrainingExecutor
 from .agent_manager import AgentManager
+from .run_queue_listener import RunQueueListener
 
 __all__ = [
     "GPUDiscoveryService",
     "TrainingExecutor",
     "AgentManager",
+    "RunQueueListener",
 ]
\ No newline at end of file
@@ -11,6 +11,7 @@ from shared.logging.config import get_logger
 from ..domain import AgentStatus, AgentConfig, TrainingProgress, RunContext
 from ..repositories import RunRepository
 from .training_executor import TrainingExecutor
+from .run_queue_listener import RunQueueListener
 
 
 class AgentManager:
@@ -18,6 +19,10 @@ class AgentManager:
     Manages the agent lifecycle including job polling, training execution, and status tracking.
     """
 
+    # Flush buffered epoch updates once this many are pending or this many seconds passed
+    _PROGRESS_FLUSH_BATCH = 16
+    _PROGRESS_FLUSH_INTERVAL = 1.0
+
     def __init__(self, config: AgentConfig):
         self.logger = get_logger("agent.manager")
         self.config = config
@@ -38,6 +43,13 @@ class AgentManager:
         # Idle logging throttling
         self._last_idle_log_ts: float = 0.0
 
+        # Epoch updates buffered by the progress callback, flushed in batches
+        self._pending_progress: list[dict] = []
+        self._last_progress_flush_ts: float = 0.0
+
+        # Set (from the listener thread) when a run is queued for this agent
+        self._work_available: Optional[asyncio.Event] = None
+
         # Dependencies
         self._run_repository = RunRepository()
         self._training_executor = TrainingExecutor()
@@ -89,21 +101,36 @@ class AgentManager:
             extra={"agent_id": self.config.agent_id, "poll_interval": self.config.poll_interval}
         )
 
-        while not self._stop_event.is_set():
-            did_work = await asyncio.get_event_loop().run_in_executor(None, self._process_next_run)
-
-            if not did_work:
-                self._log_idle_status()
-                await asyncio.sleep(self.config.poll_interval)
+        loop = asyncio.get_running_loop()
+        self._work_available = asyncio.Event()
+        queue_listener = RunQueueListener(
+            self.config.agent_id,
+            on_notify=lambda: loop.call_soon_threadsafe(self._work_available.set),
+        )
+        queue_listener.start()
 
-    def _process_next_run(self) -> bool:
-        """Process the next available run. Returns True if work was done."""
-        run_context = self._run_repository.get_next_queued_run(self.config.agent_id)
-        if not run_context:
-            return False
+        try:
+            while not self._stop_event.is_set():
+                run_context = await asyncio.to_thread(
+                    self._run_repository.get_next_queued_run, self.config.agent_id
+                )
+                if run_context is None:
+                    self._log_idle_status()
+                    await self._wait_for_work()
+                    continue
+
+                # GPU-bound training runs off the event loop for its whole duration
+                await asyncio.to_thread(self._execute_training_run, run_context)
+        finally:
+            queue_listener.stop()
 
-        self._execute_training_run(run_context)
-        return True
+    async def _wait_for_work(self) -> None:
+        """Wait until a run is announced for this agent or the poll interval elapses."""
+        try:
+            await asyncio.wait_for(self._work_available.wait(), timeout=self.config.poll_interval)
+        except asyncio.TimeoutError:
+            pass
+        self._work_available.clear()
 
     def _execute_training_run(self, run_context: RunContext) -> None:
         """Execute a training run with proper state management."""
@@ -125,6 +152,7 @@ class AgentManager:
             )
             self._finalize_run_state(run_context, success=False)
         finally:
+            self._flush_progress()
             self._clear_run_state()
 
     def _initialize_run_state(self, run_context: RunContext) -> None:
@@ -200,11 +228,14 @@ class AgentManager:
 
             eta = self._calculate_eta()
 
-        # Update database
-        self._run_repository.update_run_epoch(
-            self._current_run_id,
-            progress.epoch + 1  # Human-friendly 1-based indexing
-        )
+        # Buffer the database update; flushed in batches to keep commits off the epoch path
+        self._pending_progress.append({
+            "id": self._current_run_id,
+            "epoch": progress.epoch + 1,  # Human-friendly 1-based indexing
+        })
+        if (len(self._pending_progress) >= self._PROGRESS_FLUSH_BATCH
+                or time.time() - self._last_progress_flush_ts > self._PROGRESS_FLUSH_INTERVAL):
+            self._flush_progress()
 
         self.logger.info(
             "Training epoch completed",
@@ -216,6 +247,17 @@ class AgentManager:
             }
         )
 
+    def _flush_progress(self) -> None:
+        """Persist buffered epoch updates."""
+        pending, self._pending_progress = self._pending_progress, []
+        self._last_progress_flush_ts = time.time()
+        if not pending:
+            return
+        try:
+            self._run_repository.update_run_epochs(pending)
+        except Exception:
+            self.logger.exception("Failed to persist training progress", extra={"updates": len(pending)})
+
     def _should_stop(self) -> bool:
         """Check if training should be stopped."""
         return (self._halt_requested.is_set() or
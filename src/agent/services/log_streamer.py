@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import sys
 import threading
+import time
 from datetime import datetime, timezone
 from io import StringIO
 from typing import Optional, Callable
@@ -13,6 +14,111 @@ from shared.database import models
 from .websocket_notifier import websocket_notifier
 
 
+class RunLogBuffer:
+    """Buffers a run's log lines and writes them in batches.
+
+    Lines are flushed once FLUSH_BATCH are pending or FLUSH_INTERVAL seconds
+    have passed since the last flush, with one bulk insert, one commit and one
+    WebSocket broadcast per batch. Call flush() when the run ends.
+    """
+
+    FLUSH_BATCH = 64
+    FLUSH_INTERVAL = 1.0
+
+    def __init__(self, run_id: str):
+        self.run_id = run_id
+        self._lock = threading.Lock()
+        self._pending: list[dict] = []
+        self._last_flush_ts = time.time()
+
+    def add(self, message: str, level: str, source: str):
+        """Queue a log line, flushing if the batch is full or due."""
+        with self._lock:
+            self._pending.append({
+                "run_id": self.run_id,
+                "timestamp": datetime.now(timezone.utc),
+                "level": level,
+                "source": source,
+                "message": message.strip(),
+            })
+            due = (len(self._pending) >= self.FLUSH_BATCH
+                   or time.time() - self._last_flush_ts > self.FLUSH_INTERVAL)
+        if due:
+            self.flush()
+
+    def flush(self):
+        """Persist and broadcast buffered log lines."""
+        # Swap under the lock but write outside it: the error logging below
+        # may itself end up in a captured stream and call add()
+        with self._lock:
+            pending, self._pending = self._pending, []
+            self._last_flush_ts = time.time()
+        if not pending:
+            return
+
+        db = SessionLocal()
+        try:
+            models.bulk_insert_run_logs(db, pending)
+            db.commit()
+        except Exception as e:
+            from shared.logging.config import get_logger
+            logger = get_logger("agent.log_streamer")
+            logger.error(
+                "Failed to store log messages to database",
+                extra={"run_id": self.run_id, "count": len(pending), "error": str(e)}
+            )
+            return
+        finally:
+            db.close()
+
+        # Broadcast log events via WebSocket
+        log_events = [
+            {
+                "type": "run.log",
+                "run_id": self.run_id,
+                "timestamp": row["timestamp"].isoformat(),
+                "level": row["level"],
+                "source": row["source"],
+                "message": row["message"],
+            }
+            for row in pending
+        ]
+        self._safe_broadcast(log_events)
+
+    def _safe_broadcast(self, log_events: list[dict]):
+        """Safely broadcast log events to WebSocket clients."""
+        try:
+            import asyncio
+
+            # Check if we're in an async context
+            try:
+                loop = asyncio.get_running_loop()
+                # We're in an async context, schedule the coroutine
+                loop.create_task(websocket_notifier.notify_run_logs(self.run_id, log_events))
+            except RuntimeError:
+                # No running event loop, run in thread
+                def run_broadcast():
+                    try:
+                        asyncio.run(websocket_notifier.notify_run_logs(self.run_id, log_events))
+                    except Exception as e:
+                        from shared.logging.config import get_logger
+                        logger = get_logger("agent.log_streamer")
+                        logger.debug(
+                            "Failed to notify WebSocket in background thread",
+                            extra={"run_id": self.run_id, "error": str(e)}
+                        )
+
+                thread = threading.Thread(target=run_broadcast, daemon=True)
+                thread.start()
+        except Exception as e:
+            from shared.logging.config import get_logger
+            logger = get_logger("agent.log_streamer")
+            logger.debug(
+                "Failed to safely broadcast log events",
+                extra={"run_id": self.run_id, "error": str(e)}
+            )
+
+
 class LogStreamer:
     """Service for capturing and streaming training logs."""
 
@@ -22,6 +128,7 @@ class LogStreamer:
         self._original_stderr = sys.stderr
         self._is_capturing = False
         self._lock = threading.Lock()
+        self._buffer = RunLogBuffer(run_id)
         self._last_progress_time = 0
         self._progress_throttle_seconds = 2.0  # Only log progress every 2 seconds
 
@@ -34,8 +141,8 @@ class LogStreamer:
             self._is_capturing = True
 
             # Redirect stdout and stderr to our custom streams
-            sys.stdout = LogCapture(self.run_id, "info", "training", self._original_stdout)
-            sys.stderr = LogCapture(self.run_id, "error", "training", self._original_stderr)
+            sys.stdout = LogCapture(self.run_id, "info", "training", self._original_stdout, self._buffer)
+            sys.stderr = LogCapture(self.run_id, "error", "training", self._original_stderr, self._buffer)
 
     def stop_capture(self):
         """Stop capturing and restore original streams."""
@@ -49,6 +156,8 @@ class LogStreamer:
             sys.stdout = self._original_stdout
             sys.stderr = self._original_stderr
 
+        self._buffer.flush()
+
     def log_message(self, message: str, level: str = "info", source: str = "agent"):
         """Manually log a message to the database."""
         self._store_log(message, level, source)
@@ -80,95 +189,19 @@ class LogStreamer:
         self._store_log(message, "info", "training")
 
     def _store_log(self, message: str, level: str, source: str):
-        """Store a log message to the database."""
-        db = SessionLocal()
-        try:
-            timestamp = datetime.now(timezone.utc)
-            log_entry = models.RunLog(
-                run_id=self.run_id,
-                timestamp=timestamp,
-                level=level,
-                source=source,
-                message=message.strip()
-            )
-            db.add(log_entry)
-            db.commit()
-
-            # Broadcast log event via WebSocket
-            try:
-                log_event = {
-                    "type": "run.log",
-                    "run_id": self.run_id,
-                    "timestamp": timestamp.isoformat(),
-                    "level": level,
-                    "source": source,
-                    "message": message.strip()
-                }
-                # Schedule the broadcast safely
-                self._safe_broadcast(log_event)
-            except Exception as e:
-                from shared.logging.config import get_logger
-                logger = get_logger("agent.log_streamer")
-                logger.debug(
-                    "Failed to broadcast log event via WebSocket",
-                    extra={"run_id": self.run_id, "error": str(e)}
-                )
-
-        except Exception as e:
-            from shared.logging.config import get_logger
-            logger = get_logger("agent.log_streamer")
-            logger.error(
-                "Failed to store log message to database",
-                extra={"run_id": self.run_id, "level": level, "source": source, "error": str(e)}
-            )
-        finally:
-            db.close()
-
-    def _safe_broadcast(self, log_event: dict):
-        """Safely broadcast log event to WebSocket clients."""
-        try:
-            import asyncio
-            import threading
-
-            # Check if we're in an async context
-            try:
-                loop = asyncio.get_running_loop()
-                # We're in an async context, schedule the coroutine
-                logs = [log_event]  # Wrap single log event in list for API compatibility
-                loop.create_task(websocket_notifier.notify_run_logs(self.run_id, logs))
-            except RuntimeError:
-                # No running event loop, run in thread
-                def run_broadcast():
-                    try:
-                        logs = [log_event]
-                        asyncio.run(websocket_notifier.notify_run_logs(self.run_id, logs))
-                    except Exception as e:
-                        from shared.logging.config import get_logger
-                        logger = get_logger("agent.log_streamer")
-                        logger.debug(
-                            "Failed to notify WebSocket in background thread",
-                            extra={"run_id": self.run_id, "error": str(e)}
-                        )
-
-                thread = threading.Thread(target=run_broadcast, daemon=True)
-                thread.start()
-        except Exception as e:
-            from shared.logging.config import get_logger
-            logger = get_logger("agent.log_streamer")
-            logger.debug(
-                "Failed to safely broadcast log event",
-                extra={"run_id": self.run_id, "error": str(e)}
-            )
+        """Queue a log message for the database."""
+        self._buffer.add(message, level, source)
 
 
 class LogCapture:
     """Custom stream that captures output and stores to database."""
 
-    def __init__(self, run_id: str, level: str, source: str, original_stream):
+    def __init__(self, run_id: str, level: str, source: str, original_stream, buffer: RunLogBuffer):
         self.run_id = run_id
         self.level = level
         self.source = source
         self.original_stream = original_stream
+        self._buffer = buffer
 
     def write(self, text: str):
         """Write text to both original stream and database."""
@@ -217,82 +250,5 @@ class LogCapture:
             self.original_stream.flush()
 
     def _store_log(self, message: str):
-        """Store a log message to the database."""
-        db = SessionLocal()
-        try:
-            timestamp = datetime.now(timezone.utc)
-            log_entry = models.RunLog(
-                run_id=self.run_id,
-                timestamp=timestamp,
-                level=self.level,
-                source=self.source,
-                message=message.strip()
-            )
-            db.add(log_entry)
-            db.commit()
-
-            # Broadcast log event via WebSocket
-            try:
-                log_event = {
-                    "type": "run.log",
-                    "run_id": self.run_id,
-                    "timestamp": timestamp.isoformat(),
-                    "level": self.level,
-                    "source": self.source,
-                    "message": message.strip()
-                }
-                # Schedule the broadcast safely
-                self._safe_broadcast(log_event)
-            except Exception as e:
-                from shared.logging.config import get_logger
-                logger = get_logger("agent.log_streamer")
-                logger.debug(
-                    "Failed to broadcast log capture event via WebSocket",
-                    extra={"run_id": self.run_id, "level": self.level, "source": self.source, "error": str(e)}
-                )
-
-        except Exception as e:
-            from shared.logging.config import get_logger
-            logger = get_logger("agent.log_streamer")
-            logger.error(
-                "Failed to store log capture message to database",
-                extra={"run_id": self.run_id, "level": self.level, "source": self.source, "error": str(e)}
-            )
-        finally:
-            db.close()
-
-    def _safe_broadcast(self, log_event: dict):
-        """Safely broadcast log event to WebSocket clients."""
-        try:
-            import asyncio
-            import threading
-
-            # Check if we're in an async context
-            try:
-                loop = asyncio.get_running_loop()
-                # We're in an async context, schedule the coroutine
-                logs = [log_event]  # Wrap single log event in list for API compatibility
-                loop.create_task(websocket_notifier.notify_run_logs(self.run_id, logs))
-            except RuntimeError:
-                # No running event loop, run in thread
-                def run_broadcast():
-                    try:
-                        logs = [log_event]
-                        asyncio.run(websocket_notifier.notify_run_logs(self.run_id, logs))
-                    except Exception as e:
-                        from shared.logging.config import get_logger
-                        logger = get_logger("agent.log_streamer")
-                        logger.debug(
-                            "Failed to notify WebSocket in log capture background thread",
-                            extra={"run_id": self.run_id, "level": self.level, "source": self.source, "error": str(e)}
-                        )
-
-                thread = threading.Thread(target=run_broadcast, daemon=True)
-                thread.start()
-        except Exception as e:
-            from shared.logging.config import get_logger
-            logger = get_logger("agent.log_streamer")
-            logger.debug(
-                "Failed to safely broadcast log capture event",
-                extra={"run_id": self.run_id, "level": self.level, "source": self.source, "error": str(e)}
-            )
+        """Queue a log message for the database."""
+        self._buffer.add(message, self.level, self.source)
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import select
+import threading
+import uuid
+from typing import Callable, Optional
+
+from shared.database.connection import RUN_NOTIFY_CHANNEL_PREFIX, engine
+from shared.logging.config import get_logger
+
+
+class RunQueueListener:
+    """
+    Wakes the agent loop when Postgres announces a run queued for this agent.
+
+    Listens on the channel fed by the triggers installed by init_db(). NOTIFY
+    is best-effort, so polling stays the authoritative way runs are found; this
+    only shortens the wait. Does nothing on databases other than Postgres.
+    """
+
+    def __init__(
+        self,
+        agent_id: str,
+        on_notify: Callable[[], None],
+        select_timeout: float = 1.0,
+        reconnect_interval: float = 5.0,
+    ):
+        self.logger = get_logger("agent.run_queue_listener")
+        # Matches the lowercase text form the GUID column stores
+        self.channel = f"{RUN_NOTIFY_CHANNEL_PREFIX}{str(uuid.UUID(str(agent_id)))}"
+        self._on_notify = on_notify
+        self._select_timeout = select_timeout
+        self._reconnect_interval = reconnect_interval
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start listening in a background thread (Postgres only)."""
+        if engine.dialect.name != "postgresql" or self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="run-queue-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Ask the listener thread to exit; it closes its connection within one select timeout."""
+        self._stop_event.set()
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                self._listen()
+            except Exception as e:
+                self.logger.warning(
+                    "Run queue listener disconnected; falling back to polling until reconnect",
+                    extra={"channel": self.channel, "error": str(e)}
+                )
+                self._stop_event.wait(self._reconnect_interval)
+
+    def _listen(self) -> None:
+        # Dedicated connection kept out of the pool: it stays in autocommit
+        # mode for its whole life so notifications are delivered promptly.
+        raw = engine.raw_connection()
+        raw.detach()
+        conn = raw.driver_connection
+        try:
+            conn.autocommit = True
+            with conn.cursor() as cur:
+                cur.execute(f'LISTEN "{self.channel}"')
+            self.logger.info("Listening for queued runs", extra={"channel": self.channel})
+
+            # Anything queued while we were not listening is picked up by the next poll
+            self._on_notify()
+
+            while not self._stop_event.is_set():
+                ready, _, _ = select.select([conn], [], [], self._select_timeout)
+                if not ready:
+                    continue
+                conn.poll()
+                if conn.notifies:
+                    conn.notifies.clear()
+                    self._on_notify()
+        finally:
+            raw.close()
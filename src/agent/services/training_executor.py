@@ -3,8 +3,9 @@ from __future__ import annotations
 import os
 import traceback
 from datetime import datetime, timezone
-from typing import Optional, Callable
+from typing import Any, Optional, Callable
 
+import torch
 from huggingface_hub import login, logout
 
 from shared.logging.config import get_logger
@@ -23,6 +24,9 @@ class TrainingExecutor:
     def __init__(self):
         self.logger = get_logger("agent.training_executor")
         self._datasets_root = os.environ.get("DATASETS_DIR", "/app/datasets")
+        # Validated base configs keyed by (config_id, updated_at); a config
+        # edit bumps updated_at and so naturally misses the cache
+        self._cfg_cache: dict[tuple[str, Any], TrainConfig] = {}
 
     def execute_run(
         self,
@@ -85,30 +89,35 @@ class TrainingExecutor:
 
     def _build_train_config(self, db, run_context: RunContext) -> TrainConfig:
         """Build TrainConfig from database configuration."""
-        cfg_row = db.get(models.TrainConfigModel, run_context.config_id)
+        cfg_row = db.get(models.TrainConfigModel, run_context.config_id) if run_context.config_id else None
         if not cfg_row:
             raise RuntimeError(f"Train config {run_context.config_id} not found")
 
-        cfg_dict = dict(cfg_row.config_json)
-
-        # Note: autocast_dtype conversion is handled by TrainConfig validator
+        cache_key = (str(cfg_row.id), cfg_row.updated_at)
+        base_cfg = self._cfg_cache.get(cache_key)
+        if base_cfg is None:
+            cfg_dict = dict(cfg_row.config_json)
+            cfg_dict["root"] = self._sanitize_dataset_path(cfg_dict.get("root"))
+            # Note: autocast_dtype conversion is handled by TrainConfig validator
+            base_cfg = TrainConfig(**cfg_dict)
+            self._cfg_cache[cache_key] = base_cfg
 
         # Fetch HF token from model registry if model uses one
-        hf_token = self._get_hf_token_for_model(db, cfg_row.project_id, cfg_dict.get("model_flavour"))
+        hf_token = self._get_hf_token_for_model(db, cfg_row.project_id, base_cfg.model_flavour)
 
         if hf_token:
             login(token=hf_token)
 
-        # Set run-specific parameters
-        cfg_dict.update({
-            "run_name": run_context.run_name,
-            "tb_root": run_context.log_dir,
-            "ckpt_dir": run_context.ckpt_dir,
-            "root": self._sanitize_dataset_path(cfg_dict.get("root")),
-            "hf_token": bool(hf_token),  # Boolean flag indicating if HF token was used
-        })
-
-        return TrainConfig(**cfg_dict)
+        # Set run-specific parameters on a private copy (the runner mutates its config)
+        return base_cfg.model_copy(
+            update={
+                "run_name": run_context.run_name,
+                "tb_root": run_context.log_dir,
+                "ckpt_dir": run_context.ckpt_dir,
+                "hf_token": bool(hf_token),  # Boolean flag indicating if HF token was used
+            },
+            deep=True,
+        )
 
 
     def _sanitize_dataset_path(self, path: Optional[str]) -> str:
@@ -143,9 +152,26 @@ class TrainingExecutor:
         return os.path.join(self._datasets_root, safe_relative)
 
     def _setup_gpu_environment(self, gpu_indices: list[int]) -> None:
-        """Configure CUDA_VISIBLE_DEVICES for the training run."""
-        if gpu_indices:
-            os.environ["CUDA_VISIBLE_DEVICES"] = ",".join(str(i) for i in gpu_indices)
+        """Configure CUDA_VISIBLE_DEVICES for the training run.
+
+        The variable is only read when CUDA initializes, i.e. on the first run
+        in this process. If it already matches (the agent pins its GPU at
+        startup) nothing is touched; a different selection after CUDA has
+        initialized cannot take effect and is rejected instead of silently
+        training on the wrong device.
+        """
+        if not gpu_indices:
+            return
+        visible = ",".join(str(i) for i in gpu_indices)
+        if os.environ.get("CUDA_VISIBLE_DEVICES") == visible:
+            return
+        if torch.cuda.is_initialized():
+            raise RuntimeError(
+                f"Run requests GPUs {visible} but CUDA is already initialized in this agent "
+                f"with CUDA_VISIBLE_DEVICES={os.environ.get('CUDA_VISIBLE_DEVICES', '(unset)')}; "
+                "restart the agent to change devices"
+            )
+        os.environ["CUDA_VISIBLE_DEVICES"] = visible
 
     def _log_training_start(self, config: TrainConfig, run_context: RunContext) -> None:
         """Log training start information and diagnostics."""
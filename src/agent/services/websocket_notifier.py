@@ -67,7 +67,7 @@ class WebSocketNotifier:
         """Serialize run model for WebSocket broadcast."""
         return {
             "id": str(run.id),
-            "project_id": str(run.project_id) if run.project_id else None,
+            "project_id": str(run.project_id),
             "config_id": str(run.config_id) if run.config_id else None,
             "group_id": str(run.group_id) if run.group_id else None,
             "name": run.name,
@@ -84,8 +84,8 @@ class WebSocketNotifier:
             "seed": run.seed,
             "log_dir": run.log_dir,
             "ckpt_dir": run.ckpt_dir,
-            "created_at": run.created_at.isoformat() if run.created_at else None,
-            "updated_at": run.updated_at.isoformat() if run.updated_at else None,
+            "created_at": run.created_at.isoformat(),
+            "updated_at": run.updated_at.isoformat(),
             "gpu_indices": run.gpu_indices or [],
         }
 
@@ -1,7 +1,6 @@
 from dataclasses import dataclass, asdict
 from typing import Optional, Tuple, Any, Union, Iterable, Dict, List
 import os
-import json
 import torch
 from pydantic import BaseModel, Field, field_validator
 
@@ -12,7 +11,7 @@ class TrainConfig(BaseModel):
     batch_size: int = 256
     num_workers: int = 4
     prefetch_factor:int = 4
-    persistent_workers:bool = False
+    persistent_workers:bool = True
     epochs: int = 10
     # Optimizer
     optimizer: str = "adam"  # one of: "adam", "adamw"
@@ -23,7 +22,9 @@ class TrainConfig(BaseModel):
     grad_accum_steps: int = 1
     seed: int = 42
     autocast_dtype: str = "torch.bfloat16"
-    #log_every: int = 100
+    # torch.compile(mode="reduce-overhead") the model; drops the last partial train batch
+    compile_model: bool = False
+    log_every: int = 50  # steps between host syncs for step loss/acc logging
 
     # HF model weights
     load_pretrained: bool = True
@@ -32,7 +33,7 @@ class TrainConfig(BaseModel):
     # Logging
     run_name: Optional[str] = None
     tb_root: str = "runs"
-    eval_topk: List[int] = Field(default_factory=lambda: [3, 5])
+    eval_topk: Tuple[int, ...] = (3, 5)
     model_suffix: str = ''
     
     # Checkpoints
@@ -41,9 +42,13 @@ class TrainConfig(BaseModel):
     monitor_metric: str = "val_acc@1"  # e.g., "val_loss", "val_acc@1", "val_auroc_macro"
     monitor_mode: str = "max"          # "max" for acc/AUC, "min" for loss
     save_per_epoch_checkpoint: bool = False
+    keep_last_epoch_checkpoints: int = 0  # keep only the N most recent epoch_XXX.pt (0 = keep all)
+    save_optimizer_state: bool = False  # optimizer state in non-best epoch checkpoints (best.pt always has it)
 
     # Dataset
     max_datapoints_per_class: Union[int, List[int]] = 10_000
+    # Decode JPEGs on the GPU (nvJPEG) instead of in DataLoader workers; CUDA only
+    gpu_decode: bool = False
 
     # Optional GPU-batched augmentations (Kornia) applied on training batches.
     # Provide a JSON-serializable spec, e.g. {"preset": "cfp_dr_v1"} or
@@ -85,38 +90,20 @@ class TrainConfig(BaseModel):
         arbitrary_types_allowed = True
 
 
-def _convert_jsonable(obj: Any):
-    """Recursively convert objects so JSON can serialize them.
-
-    - Containers -> same type with converted elements
-    - torch.dtype -> string (e.g., "torch.bfloat16")
-    """
-    if isinstance(obj, dict):
-        return {k: _convert_jsonable(v) for k, v in obj.items()}
-    if isinstance(obj, (list, tuple, set)):
-        return [_convert_jsonable(v) for v in list(obj)]
-    # Handle torch dtype
-    try:
-        import torch as _torch  # local import to avoid cycles
-        if isinstance(obj, _torch.dtype):
-            return str(obj)
-    except Exception:
-        pass
-    return obj
-
 def save_train_config(cfg: TrainConfig, path: str) -> str:
     """
     Save a TrainConfig Pydantic model to JSON at `path`, overwriting if it exists.
     Returns the final path.
     """
-    data = cfg.model_dump()
+    # pydantic-core serializes straight to JSON bytes (tuples -> lists)
+    data = cfg.model_dump_json(indent=2)
     dirpath = os.path.dirname(path)
     if dirpath:
         os.makedirs(dirpath, exist_ok=True)
 
     tmp_path = path + ".tmp"
     with open(tmp_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, sort_keys=True)
+        f.write(data)
         f.write("\n")
     os.replace(tmp_path, path)  # atomic on POSIX/NT
     return path
@@ -1,11 +1,11 @@
 import os
 from typing import Callable, Optional, Tuple, Any, List, Dict
 import torch
-from torch.utils.data import Dataset, DataLoader
+from torch.utils.data import Dataset, DataLoader, get_worker_info
 from torchvision import datasets
 import random
 from torchvision.datasets.folder import default_loader
-from torchvision.io import read_image, ImageReadMode
+from torchvision.io import read_image, read_file, decode_image, decode_jpeg, ImageReadMode
 
 from collections import Counter
 
@@ -20,10 +20,21 @@ def collate_fn(batch):
 
     Returns:
         Tuple[torch.Tensor, torch.Tensor]: batched images and labels.
+
+    In a worker process the images are stacked straight into shared memory
+    (as ``default_collate`` does), so handing the batch to the main process
+    does not copy it again.
     """
     images, labels = zip(*batch)
-    images = torch.stack(images, dim=0)
-    labels = torch.tensor(labels, dtype=torch.long)
+    out = None
+    # Mirrors torch.utils.data default_collate, including its use of the private
+    # untyped_storage()._new_shared(); only worth it when a worker ships the batch
+    if get_worker_info() is not None:
+        first = images[0]
+        storage = first.untyped_storage()._new_shared(len(images) * first.numel() * first.element_size(), device="cpu")
+        out = first.new(storage).resize_(len(images), *first.shape)
+    images = torch.stack(images, dim=0, out=out)
+    labels = torch.as_tensor(labels, dtype=torch.long)
     return images, labels
 
 # Use a tensor-based loader to return CxHxW uint8 tensors (RGB)
@@ -31,6 +42,81 @@ def tensor_loader(path: str):
     return read_image(path, mode=ImageReadMode.RGB)
 
 
+# GPU-decode path: workers only read the encoded file bytes (1-D uint8 tensors)
+def encoded_loader(path: str):
+    return read_file(path)
+
+
+def collate_encoded_fn(batch):
+    """Collate encoded images (variable length) into a list, labels into a tensor."""
+    data, labels = zip(*batch)
+    return list(data), torch.tensor(labels, dtype=torch.long)
+
+
+def use_gpu_decode(cfg: TrainConfig) -> bool:
+    """Whether images are decoded on the GPU for this run."""
+    return cfg.gpu_decode and torch.cuda.is_available()
+
+
+class GPUImageDecoder:
+    """Decode a batch of encoded images on the GPU and apply per-image transforms.
+
+    Used as the ``batch_fn`` of :class:`CUDAPrefetchLoader`, so decoding runs on
+    its prefetch stream. JPEGs go through nvJPEG in one batched call; anything
+    it cannot decode (PNG, CMYK JPEG, ...) falls back to CPU decode per image.
+    ``transform`` is the usual tensor transform pipeline (it runs on device).
+    """
+
+    def __init__(self, transform: Optional[Callable], device: torch.device):
+        self.transform = transform
+        self.device = torch.device(device)
+
+    def _decode(self, data: List[torch.Tensor]) -> List[torch.Tensor]:
+        try:
+            return decode_jpeg(data, mode=ImageReadMode.RGB, device=self.device)
+        except RuntimeError:
+            images = []
+            for buf in data:
+                try:
+                    images.append(decode_jpeg(buf, mode=ImageReadMode.RGB, device=self.device))
+                except RuntimeError:
+                    images.append(decode_image(buf, mode=ImageReadMode.RGB).to(self.device, non_blocking=True))
+            return images
+
+    def __call__(self, batch):
+        data, labels = batch
+        images = self._decode(data)
+        if self.transform is not None:
+            images = [self.transform(img) for img in images]
+        return torch.stack(images, dim=0), labels.to(self.device, non_blocking=True)
+
+
+def _effective_num_workers(requested: int) -> int:
+    """Cap ``requested`` workers at the CPUs this process may run on (cgroups/affinity)."""
+    try:
+        available = len(os.sched_getaffinity(0))
+    except AttributeError:  # not available on macOS/Windows
+        available = os.cpu_count() or 1
+    return max(0, min(int(requested), available))
+
+
+def _loader_kwargs(cfg: TrainConfig, persistent: bool) -> Dict[str, Any]:
+    """DataLoader worker settings derived from the config.
+
+    ``prefetch_factor``/``persistent_workers`` are only valid with worker
+    processes; prefetch is kept in [2, 4]: enough to keep the pipeline full,
+    while every prefetched batch also holds a pinned-memory copy.
+    """
+    num_workers = _effective_num_workers(cfg.num_workers)
+    if num_workers == 0:
+        return {"num_workers": 0}
+    return {
+        "num_workers": num_workers,
+        "prefetch_factor": min(4, max(2, int(cfg.prefetch_factor or 2))),
+        "persistent_workers": bool(persistent and cfg.persistent_workers),
+    }
+
+
 def build_dataloaders(
     root: str,
     train_tfms,
@@ -96,26 +182,40 @@ def build_dataloaders(
         imagefolder_ds.imgs = new_samples  # alias used by torchvision
         imagefolder_ds.targets = new_targets
 
-    train_dataset = datasets.ImageFolder(train_p, transform=train_tfms, loader=tensor_loader)
+    # With GPU decode the datasets yield encoded bytes; transforms are applied
+    # after decoding on the device (see GPUImageDecoder)
+    if use_gpu_decode(cfg):
+        loader, batch_collate = encoded_loader, collate_encoded_fn
+        train_tfms = eval_tfms = None
+    else:
+        loader, batch_collate = tensor_loader, collate_fn
+
+    train_dataset = datasets.ImageFolder(train_p, transform=train_tfms, loader=loader)
     _apply_max_per_class(train_dataset, cfg.max_datapoints_per_class)
 
-    val_dataset   = datasets.ImageFolder(val_p,   transform=eval_tfms, loader=tensor_loader)
+    val_dataset   = datasets.ImageFolder(val_p,   transform=eval_tfms, loader=loader)
     _apply_max_per_class(val_dataset, cfg.max_datapoints_per_class)
 
-    test_dataset  = datasets.ImageFolder(test_p,  transform=eval_tfms, loader=tensor_loader) if os.path.isdir(test_p) else None
+    test_dataset  = datasets.ImageFolder(test_p,  transform=eval_tfms, loader=loader) if os.path.isdir(test_p) else None
     if test_dataset is not None:
         _apply_max_per_class(test_dataset, cfg.max_datapoints_per_class)
 
+    # Train/val are iterated every epoch, so their workers are kept alive between
+    # epochs; the test loader is used at most once and never holds idle workers.
+    # A compiled model captures CUDA graphs for a fixed batch shape, so the
+    # ragged last train batch is dropped rather than triggering a recompile.
     train_loader = DataLoader(train_dataset, batch_size=cfg.batch_size, shuffle=True,
-                              num_workers=cfg.num_workers, pin_memory=True, collate_fn=collate_fn, prefetch_factor=cfg.prefetch_factor, persistent_workers=cfg.persistent_workers)
+                              pin_memory=True, collate_fn=batch_collate,
+                              drop_last=cfg.compile_model,
+                              **_loader_kwargs(cfg, persistent=True))
     
     val_loader = DataLoader(val_dataset, batch_size=cfg.batch_size, shuffle=False,
-                            num_workers=cfg.num_workers, pin_memory=True, collate_fn=collate_fn, prefetch_factor=cfg.prefetch_factor, persistent_workers=cfg.persistent_workers)
+                            pin_memory=True, collate_fn=batch_collate, **_loader_kwargs(cfg, persistent=True))
     
     test_loader = None
     if test_dataset is not None:
         test_loader = DataLoader(test_dataset, batch_size=cfg.batch_size, shuffle=False,
-                                num_workers=cfg.num_workers, pin_memory=True, collate_fn=collate_fn, prefetch_factor=cfg.prefetch_factor, persistent_workers=cfg.persistent_workers)
+                                pin_memory=True, collate_fn=batch_collate, **_loader_kwargs(cfg, persistent=False))
     return train_loader, val_loader, test_loader
 
 def build_label_maps(train_dataset) -> Tuple[dict, dict]:
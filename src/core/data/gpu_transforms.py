@@ -1,15 +1,18 @@
 """GPU-batched data augmentation for training.
 
-This module applies lightweight, geometric-only augmentations on GPU with Kornia
-to avoid interfering with CPU-side normalization. If Kornia is not installed,
-it falls back to an identity transform.
+Batches arrive on the GPU as uint8; this module converts and normalizes them
+(``GPUNormalize``) and then applies lightweight, geometric-only augmentations
+with Kornia. If Kornia is not installed, augmentation falls back to identity
+while normalization still applies.
 """
 from __future__ import annotations
 
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Sequence
 
 import torch
 
+from ..utils.registry import validate_gpu_augmentation_spec, gpu_transforms, gpu_presets
+
 try:
     import kornia.augmentation as KA  # type: ignore
     _HAS_KORNIA = True
@@ -23,6 +26,27 @@ class _Identity(torch.nn.Module):
         return x
 
 
+class GPUNormalize(torch.nn.Module):
+    """Convert a uint8 (B,C,H,W) batch to float32 and normalize it.
+
+    ``(x / 255 - mean) / std`` is pre-baked into a per-channel scale and shift,
+    so after the dtype conversion it is a single fused multiply-add kernel.
+    Float inputs are assumed to already be scaled to [0, 1].
+    """
+
+    def __init__(self, mean: Sequence[float], std: Sequence[float]):
+        super().__init__()
+        mean_t = torch.tensor(mean, dtype=torch.float32).view(1, -1, 1, 1)
+        std_t = torch.tensor(std, dtype=torch.float32).view(1, -1, 1, 1)
+        self.register_buffer("shift", -mean_t / std_t, persistent=False)
+        self.register_buffer("scale", 1.0 / std_t, persistent=False)
+        self.register_buffer("scale_u8", 1.0 / (255.0 * std_t), persistent=False)
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        scale = self.scale_u8 if x.dtype == torch.uint8 else self.scale
+        return torch.addcmul(self.shift, x.to(torch.float32), scale)
+
+
 def _build_from_preset(name: str) -> torch.nn.Module:
     """Known-good augmentation presets.
 
@@ -41,6 +65,10 @@ def _build_from_preset(name: str) -> torch.nn.Module:
                 align_corners=False,
             ),
         )
+    # Other presets are defined by their op list in the registry
+    preset_spec = gpu_presets.get(lname)
+    if preset_spec is not None and isinstance(preset_spec.config.get("ops"), list):
+        return _build_from_ops(preset_spec.config["ops"])
     # Fallback: identity
     return _Identity()
 
@@ -60,7 +88,9 @@ def _build_from_ops(ops: List[Dict[str, Any]]) -> torch.nn.Module:
         "RandomRotation": KA.RandomRotation,
         "RandomAffine": KA.RandomAffine,
         "RandomPerspective": KA.RandomPerspective,
-        # Avoid color/intensity jitter here since inputs are normalized
+        # Additive noise is defined on the normalized scale; avoid color jitter
+        # here since its ranges assume [0, 1] inputs
+        "RandomGaussianNoise": KA.RandomGaussianNoise,
     }
     layers = []
     for spec in ops:
@@ -83,16 +113,35 @@ def _build_from_ops(ops: List[Dict[str, Any]]) -> torch.nn.Module:
     return torch.nn.Sequential(*layers)
 
 
-def build_gpu_train_augment(spec: Optional[Dict[str, Any]] = None) -> torch.nn.Module:
-    """Return a GPU-side augmentation pipeline from a spec/preset.
+def build_gpu_train_augment(
+    spec: Optional[Dict[str, Any]] = None,
+    mean: Optional[Sequence[float]] = None,
+    std: Optional[Sequence[float]] = None,
+) -> torch.nn.Module:
+    """Return a GPU-side train pipeline: normalization + augmentation from a spec/preset.
 
-    - If Kornia is unavailable or ``spec`` is None/empty, returns identity.
+    - If ``mean``/``std`` are given, a ``GPUNormalize`` step is prepended.
+    - If Kornia is unavailable or ``spec`` is None/empty, augmentation is identity.
     - Spec may be {"preset": "cfp_dr_v1"} or {"ops": [{"name": "Random...", ...}, ...]}
     - Now validates against the centralized registry
 
-    Notes: Assumes input is already float32 and normalized on CPU; therefore
-    we intentionally restrict to geometric-only operations here.
+    Notes: augmentations run after normalization; therefore we intentionally
+    restrict to geometric-only operations here.
     """
+    augment = _build_gpu_augment(spec)
+    if mean is None or std is None:
+        return augment
+    if isinstance(augment, _Identity):
+        return GPUNormalize(mean, std)
+    return torch.nn.Sequential(GPUNormalize(mean, std), augment)
+
+
+def build_gpu_eval_transform(mean: Sequence[float], std: Sequence[float]) -> torch.nn.Module:
+    """Return the GPU-side eval pipeline (normalization only)."""
+    return GPUNormalize(mean, std)
+
+
+def _build_gpu_augment(spec: Optional[Dict[str, Any]]) -> torch.nn.Module:
     if not _HAS_KORNIA or not spec:
         return _Identity()
 
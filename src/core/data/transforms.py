@@ -3,8 +3,8 @@ using HF processor metadata for size/normalization.
 
 Now uses the centralized registry system for color jitter validation.
 """
+import functools
 from typing import Tuple, Optional, Dict, Any
-import torch
 from torchvision import transforms
 from torchvision.transforms import InterpolationMode
 from transformers import AutoImageProcessor
@@ -13,6 +13,15 @@ from shared.logging.config import get_logger
 
 logger = get_logger("core.transforms")
 
+@functools.lru_cache(maxsize=8)
+def _get_processor(model_flavour: str, use_fast: bool = True) -> AutoImageProcessor:
+    """Load (once per process) the HF image processor for ``model_flavour``.
+
+    Only its metadata (size, mean/std) is read, so sharing one instance is safe.
+    """
+    return AutoImageProcessor.from_pretrained(model_flavour, use_fast=use_fast)
+
+
 def _get_target_image_size(processor: AutoImageProcessor) -> int:
     size = getattr(processor, "size", None)
     if isinstance(size, dict):
@@ -79,33 +88,42 @@ def _build_color_jitter_from_spec(spec: Optional[Dict[str, Any]]):
 def build_transforms(model_flavour: str, train_color_jitter_spec: Optional[Dict[str, Any]] = None) -> Tuple[transforms.Compose, transforms.Compose]:
     """Return train/eval transforms for tensor inputs.
 
-    Expects input images as CxHxW uint8 tensors (from torchvision.io.read_image)."""
-    processor = AutoImageProcessor.from_pretrained(model_flavour, use_fast=True)
+    Expects input images as CxHxW uint8 tensors (from torchvision.io.read_image)
+    and keeps them uint8: dtype conversion and normalization run batched on the
+    GPU (see ``core.data.gpu_transforms.GPUNormalize``)."""
+    processor = _get_processor(model_flavour)
     size = _get_target_image_size(processor)
-    mean = processor.image_mean
-    std = processor.image_std
 
     color_jitter = _build_color_jitter_from_spec(train_color_jitter_spec)
 
     train_ops = [
         transforms.Resize(size, interpolation=InterpolationMode.BILINEAR),
         transforms.CenterCrop(size),
-        transforms.ConvertImageDtype(torch.float32),
     ]
     if color_jitter is not None:
         train_ops.append(color_jitter)
-    train_ops.append(transforms.Normalize(mean=mean, std=std))
     train_tfms = transforms.Compose(train_ops)
 
     eval_tfms = transforms.Compose([
         transforms.Resize(size, interpolation=InterpolationMode.BILINEAR),
         transforms.CenterCrop(size),
-        transforms.ConvertImageDtype(torch.float32),
-        transforms.Normalize(mean=mean, std=std),
     ])
     return train_tfms, eval_tfms
 
 
+@functools.lru_cache(maxsize=8)
+def get_normalization_stats(model_flavour: str) -> Tuple[Tuple[float, ...], Tuple[float, ...]]:
+    """Return the (mean, std) the model's image processor normalizes with.
+
+    Cached per flavour as immutable tuples; ``GPUNormalize`` bakes them into
+    device-resident scale/shift buffers once per run.
+    """
+    processor = _get_processor(model_flavour)
+    mean = getattr(processor, "image_mean", None) or (0.5, 0.5, 0.5)
+    std = getattr(processor, "image_std", None) or (0.5, 0.5, 0.5)
+    return tuple(float(m) for m in mean), tuple(float(s) for s in std)
+
+
 def get_available_color_presets() -> Dict[str, Any]:
     """Get all available CPU color jitter presets for UI consumption."""
     return cpu_color_presets.to_json()
@@ -17,23 +17,55 @@ from torch import nn
 from torch.utils.tensorboard import SummaryWriter
 from transformers import get_cosine_schedule_with_warmup
 
-from core.utils.checkpoint import save_model_checkpoints
+from core.utils.checkpoint import save_model_checkpoints, wait_for_pending_checkpoint, reset_checkpoint_state
 from core.config import TrainConfig, save_train_config
 from core.utils.cuda_helper import CUDAPrefetchLoader
-from core.data.datasets import build_dataloaders, build_label_maps
+from core.data.datasets import build_dataloaders, build_label_maps, use_gpu_decode, GPUImageDecoder
 from core.utils.losses import build_loss_function
 from core.training.model import build_model
 from core.utils.optimizers import build_optimizer
 from core.utils.seed import get_device, set_seed
 from core.utils.tb import create_tb_writer, log_confusion_matrix_table
-from core.data.transforms import build_transforms
-from core.data.gpu_transforms import build_gpu_train_augment
+from core.data.transforms import build_transforms, get_normalization_stats
+from core.data.gpu_transforms import build_gpu_train_augment, build_gpu_eval_transform
 import core.training.train_eval as train_eval
 from shared.logging.config import get_logger
 
 logger = get_logger("core.runner")
 
 
+class _CompiledModel:
+    """Call a ``torch.compile``d model, falling back to eager if it fails.
+
+    Compilation (and CUDA graph capture) happens lazily on the first forward,
+    so a failure only surfaces there; it is logged once and the eager model is
+    used from then on. Everything else (train()/eval(), parameters(), ...) is
+    delegated to the eager module, which shares the compiled one's weights.
+
+    With mode="reduce-overhead" outputs live in CUDA graph memory that the next
+    replay overwrites; callers must copy or reduce anything they keep across
+    steps.
+    """
+
+    def __init__(self, eager: torch.nn.Module, compiled):
+        self._eager = eager
+        self._compiled = compiled
+
+    def __call__(self, *args, **kwargs):
+        if self._compiled is not None:
+            try:
+                # Each call is a new step for the CUDA graph trees
+                torch.compiler.cudagraph_mark_step_begin()
+                return self._compiled(*args, **kwargs)
+            except Exception as e:
+                logger.warning("Compiled model failed; falling back to eager", extra={"error": str(e)})
+                self._compiled = None
+        return self._eager(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._eager, name)
+
+
 def _perform_checkpoint(
     cfg: TrainConfig,
     model: torch.nn.Module,
@@ -59,6 +91,8 @@ def _perform_checkpoint(
         mode=cfg.monitor_mode,
         best_ckpt_name="best.pt",
         save_per_epoch_checkpoint=cfg.save_per_epoch_checkpoint,
+        keep_last_epoch_checkpoints=cfg.keep_last_epoch_checkpoints,
+        save_optimizer_state=cfg.save_optimizer_state,
     )
     if is_best:
         logger.info(
@@ -105,14 +139,26 @@ def run_experiment(
     train_loader, val_loader, test_loader = build_dataloaders(
         root=cfg.root, train_tfms=train_tfms, eval_tfms=eval_tfms, cfg=cfg
     )
-    train_loader = CUDAPrefetchLoader(train_loader)
-    val_loader = CUDAPrefetchLoader(val_loader)
-    if test_loader:
-        test_loader = CUDAPrefetchLoader(test_loader)  # noqa: F841
+    if use_gpu_decode(cfg):
+        # Workers only read bytes; decode + per-image transforms run on the GPU
+        train_loader = CUDAPrefetchLoader(train_loader, batch_fn=GPUImageDecoder(train_tfms, device))
+        val_loader = CUDAPrefetchLoader(val_loader, batch_fn=GPUImageDecoder(eval_tfms, device))
+        if test_loader:
+            test_loader = CUDAPrefetchLoader(test_loader, batch_fn=GPUImageDecoder(eval_tfms, device))  # noqa: F841
+    else:
+        train_loader = CUDAPrefetchLoader(train_loader)
+        val_loader = CUDAPrefetchLoader(val_loader)
+        if test_loader:
+            test_loader = CUDAPrefetchLoader(test_loader)  # noqa: F841
 
-    # Build GPU-batched training augmentations (size-preserving, geometric only)
-    # Only enabled when provided via cfg.gpu_batch_aug (kept identity otherwise)
-    train_batch_tf = build_gpu_train_augment(getattr(cfg, "gpu_batch_aug", None)).to(device=device)
+    # Batches stay uint8 up to the GPU; normalization runs there, followed by
+    # GPU-batched training augmentations (size-preserving, geometric only)
+    # when provided via cfg.gpu_batch_aug
+    norm_mean, norm_std = get_normalization_stats(cfg.model_flavour)
+    train_batch_tf = build_gpu_train_augment(
+        getattr(cfg, "gpu_batch_aug", None), mean=norm_mean, std=norm_std
+    ).to(device=device)
+    eval_batch_tf = build_gpu_eval_transform(norm_mean, norm_std).to(device=device)
 
     label2id, id2label = build_label_maps(train_loader.loader.dataset)  # type: ignore[attr-defined]
     num_labels = len(label2id)
@@ -131,6 +177,19 @@ def run_experiment(
         load_pretrained=cfg.load_pretrained,
         freeze_backbone=cfg.freeze_backbone,
     ).to(device)
+    if torch.cuda.is_available():
+        # NHWC lets cuDNN pick Tensor Core kernels without layout transposes
+        model = model.to(memory_format=torch.channels_last)
+
+    # Optionally compile the model for the train/eval steps. Checkpoints keep
+    # using the uncompiled module so state_dict keys stay unprefixed.
+    step_model = model
+    if cfg.compile_model:
+        try:
+            step_model = _CompiledModel(model, torch.compile(model, mode="reduce-overhead", dynamic=False))
+        except Exception as e:
+            logger.warning("torch.compile failed; training eagerly", extra={"error": str(e)})
+            step_model = model
 
     # Build optimizer using registry-based builder
     opt_name = getattr(cfg, "optimizer", "adam").lower()
@@ -151,7 +210,12 @@ def run_experiment(
     # Build loss function using registry-based builder
     loss_name = getattr(cfg, "loss_name", "cross_entropy")
     loss_fn = build_loss_function(loss_name)
-    scaler = torch.GradScaler("cuda", enabled=torch.cuda.is_available())
+    autocast_dtype = cfg.get_torch_dtype()
+    if autocast_dtype == torch.bfloat16 and torch.cuda.is_available() and not torch.cuda.is_bf16_supported():
+        logger.warning("bfloat16 autocast is not supported on this GPU; falling back to float16")
+        autocast_dtype = torch.float16
+    # Loss scaling is only needed for float16; bfloat16 has float32's range
+    scaler = torch.GradScaler("cuda", enabled=torch.cuda.is_available() and autocast_dtype == torch.float16)
 
     # Logging
     writer: Optional[SummaryWriter]
@@ -164,6 +228,8 @@ def run_experiment(
     best_epoch_so_far: Optional[int] = None
     best_acc_at_best: Optional[float] = None
 
+    # Set when training itself fails, so cleanup errors never mask it
+    training_error: Optional[BaseException] = None
     try:
         for epoch in range(cfg.epochs):
             if should_stop and should_stop():
@@ -173,7 +239,7 @@ def run_experiment(
 
             train_metrics = train_eval.train_one_epoch(
                 dataloader=train_loader,
-                model=model,
+                model=step_model,
                 loss_fn=loss_fn,
                 optimizer=optimizer,
                 device=device,
@@ -184,10 +250,11 @@ def run_experiment(
                 global_step_start=global_step,
                 max_grad_norm=cfg.max_grad_norm,
                 grad_accum_steps=cfg.grad_accum_steps,
-                autocast_dtype=cfg.get_torch_dtype(),
+                autocast_dtype=autocast_dtype,
                 batch_transform=train_batch_tf,
                 log_streamer=log_streamer,
                 total_epochs=cfg.epochs,
+                log_every=cfg.log_every,
             )
             global_step += steps_per_epoch
 
@@ -197,7 +264,7 @@ def run_experiment(
 
             eval_metrics = train_eval.evaluate(
                 dataloader=val_loader,
-                model=model,
+                model=step_model,
                 loss_fn=loss_fn,
                 device=device,
                 epoch=epoch,
@@ -207,21 +274,29 @@ def run_experiment(
                 log_prefix="val",
                 fig_dir=os.path.join(tb_log_dir, "figures"),
                 topks=cfg.eval_topk,
-                autocast_dtype=cfg.get_torch_dtype(),
+                autocast_dtype=autocast_dtype,
+                batch_transform=eval_batch_tf,
             )
 
             if writer:
-                writer.add_scalar("val/loss", eval_metrics["val_loss"], epoch)
-                for metric_key, metric_val in eval_metrics.items():
-                    if metric_key.startswith("val_acc@"):
-                        k = metric_key.split("@", 1)[1]
-                        writer.add_scalar(f"val/acc@{k}", metric_val, epoch)
-                writer.add_scalar("val/auroc_macro", eval_metrics["val_auroc_macro"], epoch)
-                writer.add_scalar("val/map", eval_metrics["val_map"], epoch)
-                writer.add_scalar("val/f1_macro", eval_metrics["val_f1_macro"], epoch)
-                writer.add_scalar("val/cohenkappa", eval_metrics["val_cohenkappa"], epoch)
-                writer.add_scalar("val/recall_micro", eval_metrics["val_recall_micro"], epoch)
-                writer.add_scalar("val/recall_macro", eval_metrics["val_recall_macro"], epoch)
+                val_scalars = {
+                    "loss": eval_metrics["val_loss"],
+                    **{
+                        f"acc@{key.split('@', 1)[1]}": val
+                        for key, val in eval_metrics.items() if key.startswith("val_acc@")
+                    },
+                    "auroc_macro": eval_metrics["val_auroc_macro"],
+                    "map": eval_metrics["val_map"],
+                    "f1_macro": eval_metrics["val_f1_macro"],
+                    "cohenkappa": eval_metrics["val_cohenkappa"],
+                    "recall_micro": eval_metrics["val_recall_micro"],
+                    "recall_macro": eval_metrics["val_recall_macro"],
+                }
+                # Same wall time for the epoch's points; writes are queued and
+                # flushed by the writer's background thread
+                walltime = time.time()
+                for name, val in val_scalars.items():
+                    writer.add_scalar(f"val/{name}", val, epoch, walltime=walltime)
                 log_confusion_matrix_table(
                     writer, "Confusion_Matrix", eval_metrics["confusion_matrix"], None, global_step=epoch
                 )
@@ -256,7 +331,34 @@ def run_experiment(
                     )
             if should_stop and should_stop():
                 break
+    except BaseException as e:
+        training_error = e
+        raise
     finally:
+        # Every cleanup step runs even if an earlier one fails; the first
+        # failure is re-raised once the writer is closed (unless training
+        # already failed, in which case that error propagates instead)
+        cleanup_error: Optional[BaseException] = None
+        # Checkpoints are flushed in the background; the run is not done until
+        # the last one is on disk
+        try:
+            wait_for_pending_checkpoint()
+        except Exception as e:
+            logger.error(
+                "Background checkpoint write failed",
+                extra={"error": str(e)}
+            )
+            cleanup_error = cleanup_error or e
+        # No write is in flight any more; release the run's pinned staging memory
+        reset_checkpoint_state()
+        # Evaluation figures are rendered in the background and log to the writer
+        try:
+            train_eval.wait_for_pending_figures()
+        except Exception as e:
+            logger.warning(
+                "Failed to render evaluation figures",
+                extra={"error": str(e)}
+            )
         # Ensure TensorBoard file handles are released to prevent FD leaks
         if writer is not None:
             try:
@@ -273,5 +375,7 @@ def run_experiment(
                     "Failed to close TensorBoard writer",
                     extra={"error": str(e)}
                 )
+        if cleanup_error is not None and training_error is None:
+            raise cleanup_error
             
     return tb_log_dir
@@ -1,5 +1,6 @@
 from typing import Iterable, Tuple, Dict, Optional, Any, Union
 import os
+from concurrent.futures import Future, ThreadPoolExecutor
 import torch
 from torch import nn
 from torch.optim import Optimizer
@@ -21,6 +22,36 @@ from torch.utils.data import DataLoader
 from ..utils.cuda_helper import CUDAPrefetchLoader
 
 
+# matplotlib rendering is slow, single-threaded Python; evaluation figures are
+# drawn on one background thread (which also keeps all pyplot use on a single
+# thread) so training can continue meanwhile.
+_FIG_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="eval-figures")
+_pending_figures: Optional[Future] = None
+
+
+def wait_for_pending_figures() -> None:
+    """Block until the in-flight evaluation figures (if any) are written.
+
+    Re-raises any error the background render hit.
+    """
+    global _pending_figures
+    fut, _pending_figures = _pending_figures, None
+    if fut is not None:
+        fut.result()
+
+
+def _render_and_log_figures(cm, class_names, fpr, tpr, auc_macro, epoch, log_prefix, cm_path, roc_path, tb_writer) -> None:
+    """Save the confusion matrix and ROC(micro) figures and log them to TensorBoard."""
+    cm_fig = plot_confusion_matrix(cm, class_names, title=f"{log_prefix.upper()} Confusion Matrix (epoch {epoch+1})")
+    roc_fig = plot_roc_micro(fpr, tpr, auc_macro, title=f"{log_prefix.upper()} ROC (micro) epoch {epoch+1}")
+    # One figure each serves both the PNG on disk and TensorBoard
+    if tb_writer is not None:
+        tb_writer.add_figure(f"{log_prefix}/confusion_matrix", cm_fig, global_step=epoch, close=False)
+        tb_writer.add_figure(f"{log_prefix}/roc_micro", roc_fig, global_step=epoch, close=False)
+    save_figure(cm_fig, cm_path)
+    save_figure(roc_fig, roc_path)
+
+
 def train_one_epoch(
     dataloader: Union[DataLoader, CUDAPrefetchLoader],
     model: torch.nn.Module,
@@ -38,18 +69,27 @@ def train_one_epoch(
     batch_transform: Optional[torch.nn.Module] = None,
     log_streamer = None,
     total_epochs: int = 1,
+    log_every: int = 50,
 )-> Dict[str, float]:
     """Train one full epoch.
 
-    Logs per-step metrics if ``tb_writer`` is provided and returns average
-    loss and accuracy for the epoch.
+    Logs step metrics every ``log_every`` steps if ``tb_writer`` is provided and
+    returns average loss and accuracy for the epoch.
     """
     
     model.train()
-    running_loss = 0.0
-    running_acc = 0.0
+    # Loss/accuracy are accumulated on device; the host only syncs every
+    # ``log_every`` steps (and at epoch end) so prefetch keeps overlapping compute
+    running_loss = torch.zeros((), device=device)
+    running_correct = torch.zeros((), dtype=torch.long, device=device)
+    running_samples = 0
     n_batches = 0
     global_step = global_step_start
+    log_every = max(1, int(log_every))
+    use_loss_scaling = scaler.is_enabled()
+    # Gradient accumulation: backward every micro-batch, optimizer step (and
+    # zero_grad) only every ``grad_accum`` batches and on the last batch
+    grad_accum = max(1, int(grad_accum_steps))
 
     # Use custom progress tracker if log_streamer available, otherwise use tqdm
     if log_streamer:
@@ -65,6 +105,7 @@ def train_one_epoch(
     else:
         progress_bar = tqdm(dataloader, total=len(dataloader), desc="Processing", unit="batch", leave=True)
     optimizer.zero_grad(set_to_none=True)
+    num_steps = len(dataloader)
     for batch_idx, (input, expected) in enumerate(progress_bar):
         input = input.to(device, non_blocking=True)
         expected = expected.to(device, non_blocking=True)
@@ -72,47 +113,59 @@ def train_one_epoch(
         with torch.autocast(device_type="cuda", dtype=autocast_dtype, enabled=torch.cuda.is_available()):
             if batch_transform is not None:
                 input = batch_transform(input)
+            input = input.contiguous(memory_format=torch.channels_last)
             logits = model(input).logits
             loss = loss_fn(logits, expected)
         
-        loss_to_backprop = loss / max(1, grad_accum_steps)
-        prev_scale = scaler.get_scale()
+        loss_to_backprop = loss / grad_accum if grad_accum > 1 else loss
         scaler.scale(loss_to_backprop).backward()
 
-        do_step = ((batch_idx + 1) % max(1, grad_accum_steps) == 0) or ((batch_idx + 1) == len(dataloader))
+        do_step = ((batch_idx + 1) % grad_accum == 0) or ((batch_idx + 1) == num_steps)
         if do_step:
             # Gradient clipping (after unscale) to improve stability
             if max_grad_norm is not None and max_grad_norm > 0:
                 scaler.unscale_(optimizer)
                 torch.nn.utils.clip_grad_norm_(model.parameters(), max_grad_norm)
 
+            # The scale only changes in update(); reading it syncs, so only do
+            # so when loss scaling is active (fp16) to detect skipped steps
+            prev_scale = scaler.get_scale() if use_loss_scaling else None
             scaler.step(optimizer)
             scaler.update()
             optimizer.zero_grad(set_to_none=True)
 
-            if scheduler and scaler.get_scale() >= prev_scale:
+            if scheduler and (prev_scale is None or scaler.get_scale() >= prev_scale):
                 scheduler.step()
         
         
         with torch.no_grad():
-            preds = torch.argmax(logits, dim=1)
-            batch_acc = (preds == expected).float().mean().item()
-        running_loss += loss.item()
-        running_acc += batch_acc
+            # Copy: a compiled (CUDA graph) model's outputs are overwritten by the next step
+            loss_d = loss.detach().to(torch.float32, copy=True)
+            batch_correct = (logits.argmax(dim=1) == expected).sum()
+            running_loss += loss_d
+            running_correct += batch_correct
         n_batches += 1
+        batch_samples = expected.numel()
+        running_samples += batch_samples
 
-        # ---- Per-step TensorBoard logging ----
-        if tb_writer is not None:
-            lr = optimizer.param_groups[0]["lr"] if optimizer.param_groups else float("nan")
-            tb_writer.add_scalar("train/step_loss", loss.item(), global_step)
-            tb_writer.add_scalar("train/step_acc@1", batch_acc, global_step)
-            tb_writer.add_scalar("train/lr", lr, global_step)
+        if (batch_idx + 1) % log_every == 0 or (batch_idx + 1) == num_steps:
+            loss_val, correct_val, running_correct_val = torch.stack(
+                (loss_d, batch_correct.float(), running_correct.float())
+            ).tolist()
+            acc_val = correct_val / max(1, batch_samples)
+            avg_acc_so_far = running_correct_val / max(1, running_samples)
 
-        avg_acc_so_far = running_acc / max(1, n_batches)
-        progress_bar.set_postfix({
-            "loss": f"{loss.item():.4f}",
-            "avg_acc@1": f"{avg_acc_so_far:.4f}"
-        })
+            # ---- Periodic TensorBoard logging ----
+            if tb_writer is not None:
+                lr = optimizer.param_groups[0]["lr"] if optimizer.param_groups else float("nan")
+                tb_writer.add_scalar("train/step_loss", loss_val, global_step)
+                tb_writer.add_scalar("train/step_acc@1", acc_val, global_step)
+                tb_writer.add_scalar("train/lr", lr, global_step)
+
+            progress_bar.set_postfix({
+                "loss": f"{loss_val:.4f}",
+                "avg_acc@1": f"{avg_acc_so_far:.4f}"
+            })
 
         global_step += 1
     
@@ -120,11 +173,49 @@ def train_one_epoch(
     progress_bar.close()
     print('')
 
-    avg_loss = running_loss / max(1, n_batches)
-    avg_acc = running_acc / max(1, n_batches)
+    avg_loss = running_loss.item() / max(1, n_batches)
+    avg_acc = running_correct.item() / max(1, running_samples)
     return {"train_loss": avg_loss, "train_acc@1": avg_acc}
 
 
+# Metric objects per (num_classes, topks, device), reused across epochs instead
+# of being rebuilt. They are reset as soon as their results are read, so no
+# predictions stay on the device between evaluations (or runs).
+_EVAL_METRICS_CACHE: Dict[Tuple[int, Tuple[int, ...], str], Dict[str, Any]] = {}
+
+
+def _get_eval_metrics(num_classes: int, topks: Tuple[int, ...], device: torch.device) -> Dict[str, Any]:
+    key = (num_classes, topks, str(device))
+    metrics = _EVAL_METRICS_CACHE.get(key)
+    if metrics is None:
+        metrics = {
+            "acc_top1": MulticlassAccuracy(num_classes=num_classes).to(device),
+            "map_macro": MulticlassAveragePrecision(num_classes=num_classes, average="macro").to(device),
+            "topk": {k: MulticlassAccuracy(num_classes=num_classes, top_k=k).to(device) for k in topks},
+            "f1_macro": MulticlassF1Score(num_classes=num_classes, average="macro").to(device),
+            "auroc_macro": MulticlassAUROC(num_classes=num_classes, average="macro").to(device),
+            "cm": MulticlassConfusionMatrix(num_classes=num_classes).to(device),
+            "roc_micro": MulticlassROC(num_classes=num_classes, average="micro").to(device),
+            "cohenkappa": CohenKappa(task="multiclass", num_classes=num_classes).to(device),
+            "recall_micro": Recall(task="multiclass", average='micro', num_classes=num_classes).to(device),
+            "recall_macro": Recall(task="multiclass", average='macro', num_classes=num_classes).to(device),
+        }
+        _EVAL_METRICS_CACHE[key] = metrics
+        return metrics
+    _reset_eval_metrics(metrics)
+    return metrics
+
+
+def _reset_eval_metrics(metrics: Dict[str, Any]) -> None:
+    """Drop accumulated state (e.g. AUROC/ROC keep every prediction on device)."""
+    for name, metric in metrics.items():
+        if name == "topk":
+            for m in metric.values():
+                m.reset()
+        else:
+            metric.reset()
+
+
 @torch.no_grad()
 def evaluate(
     dataloader: Union[DataLoader, CUDAPrefetchLoader],
@@ -139,72 +230,101 @@ def evaluate(
     log_prefix: str = "val",
     topks: Tuple[int, ...] = (3, 5),
     fig_dir: Optional[str] = None,
+    batch_transform: Optional[torch.nn.Module] = None,
 )-> Dict[str, Any]:
     """Evaluate model and compute a suite of multiclass metrics.
 
     Also generates and optionally logs confusion matrix and ROC(micro) figures.
     """
     model.eval()
+    # Don't let figure renders pile up behind a slow disk
+    wait_for_pending_figures()
 
-    acc_top1 = MulticlassAccuracy(num_classes=num_classes).to(device)
-    map_macro = MulticlassAveragePrecision(num_classes=num_classes, average="macro").to(device)
-    topk_metrics = {k: MulticlassAccuracy(num_classes=num_classes, top_k=k).to(device) for k in topks}
-    f1_macro = MulticlassF1Score(num_classes=num_classes, average="macro").to(device)
-    auroc_macro = MulticlassAUROC(num_classes=num_classes, average="macro").to(device)
-    cm_metric = MulticlassConfusionMatrix(num_classes=num_classes).to(device)
-    roc_micro = MulticlassROC(num_classes=num_classes, average="micro").to(device)
-    cohenkappa = CohenKappa(task="multiclass", num_classes=num_classes).to(device)
-    recall_micro = Recall(task="multiclass", average='micro', num_classes=num_classes).to(device)
-    recall_macro = Recall(task="multiclass", average='macro', num_classes=num_classes).to(device)
-
-    total_loss = 0.0
-    nb = 0
-
-    # Use simpler progress for evaluation (no log streaming needed)
-    progress_bar = tqdm(dataloader, total=len(dataloader), desc="Evaluating", unit="batch")
-    for batch_idx, (X, y) in enumerate(progress_bar):
-        X = X.to(device, non_blocking=True)
-        y = y.to(device, non_blocking=True)
+    metrics = _get_eval_metrics(num_classes, tuple(topks), device)
+    acc_top1 = metrics["acc_top1"]
+    map_macro = metrics["map_macro"]
+    topk_metrics = metrics["topk"]
+    f1_macro = metrics["f1_macro"]
+    auroc_macro = metrics["auroc_macro"]
+    cm_metric = metrics["cm"]
+    roc_micro = metrics["roc_micro"]
+    cohenkappa = metrics["cohenkappa"]
+    recall_micro = metrics["recall_micro"]
+    recall_macro = metrics["recall_macro"]
 
-        with torch.autocast(device_type="cuda", dtype=autocast_dtype, enabled=torch.cuda.is_available()):
-            logits = model(X).logits
-            probs = torch.softmax(logits, dim=1)
-            total_loss += loss_fn(logits, y).item()
+    try:
+        total_loss = torch.zeros((), device=device)
+        nb = 0
+        # Logits/targets are buffered on device and every metric is updated once
+        # after the loop, so argmax/softmax run a single time over the whole split
+        all_logits = []
+        all_targets = []
+
+        # Use simpler progress for evaluation (no log streaming needed)
+        progress_bar = tqdm(dataloader, total=len(dataloader), desc="Evaluating", unit="batch")
+        for batch_idx, (X, y) in enumerate(progress_bar):
+            X = X.to(device, non_blocking=True)
+            y = y.to(device, non_blocking=True)
+
+            with torch.autocast(device_type="cuda", dtype=autocast_dtype, enabled=torch.cuda.is_available()):
+                if batch_transform is not None:
+                    X = batch_transform(X)
+                X = X.contiguous(memory_format=torch.channels_last)
+                logits = model(X).logits
+                total_loss += loss_fn(logits, y).detach().float()
         
-        nb += 1
-
-        acc_top1.update(logits, y)
-        map_macro.update(logits, y)
-        for k, m in topk_metrics.items():
-            m.update(logits, y)
-        f1_macro.update(logits, y)
-        auroc_macro.update(probs, y)
-        cm_metric.update(logits, y)
-        roc_micro.update(probs, y)
-        preds_eval = torch.argmax(logits, dim=1)
-        cohenkappa.update(preds_eval, y)
-        recall_micro.update(preds_eval, y)
-        recall_macro.update(preds_eval, y)
+            nb += 1
+            # Copy: a compiled (CUDA graph) model's outputs are overwritten by the next step
+            all_logits.append(logits.to(torch.float32, copy=True))
+            all_targets.append(y)
+
+        if all_logits:
+            logits = torch.cat(all_logits)
+            y = torch.cat(all_targets)
+            probs = torch.softmax(logits, dim=1)
+            preds_eval = torch.argmax(logits, dim=1)
+
+            acc_top1.update(preds_eval, y)
+            map_macro.update(logits, y)
+            for k, m in topk_metrics.items():
+                m.update(logits, y)
+            f1_macro.update(preds_eval, y)
+            auroc_macro.update(probs, y)
+            cm_metric.update(preds_eval, y)
+            roc_micro.update(probs, y)
+            cohenkappa.update(preds_eval, y)
+            recall_micro.update(preds_eval, y)
+            recall_macro.update(preds_eval, y)
     
-    progress_bar.clear()
-    progress_bar.close()
-    print()
-
-    avg_loss = total_loss / max(nb, 1)
-    acc1 = acc_top1.compute().item()
-    map = map_macro.compute().item()
-    topk_vals = {k: m.compute().item() for k, m in topk_metrics.items()}
-    f1_val = f1_macro.compute().item()
-    auc_macro = auroc_macro.compute().item()
-    cm = cm_metric.compute().cpu().numpy()
-    cohenk = cohenkappa.compute().cpu().numpy()
-    recall_mi = recall_micro.compute().cpu().numpy()
-    recall_ma = recall_macro.compute().cpu().numpy()
-
-    # ROC (micro) curve points
-    fpr, tpr, _ = roc_micro.compute()  # tensors of shape (N,)
-    fpr = fpr.cpu().numpy()
-    tpr = tpr.cpu().numpy()
+        progress_bar.clear()
+        progress_bar.close()
+        print()
+
+        # Compute everything on device, then bring it back in one batch of copies
+        # with a single synchronize instead of one blocking transfer per metric
+        fpr_t, tpr_t, _ = roc_micro.compute()  # ROC (micro) curve points, shape (N,)
+        topk_keys = list(topk_metrics)
+        scalars_t = torch.stack([
+            total_loss.float(),
+            acc_top1.compute().float(),
+            map_macro.compute().float(),
+            f1_macro.compute().float(),
+            auroc_macro.compute().float(),
+            cohenkappa.compute().float(),
+            recall_micro.compute().float(),
+            recall_macro.compute().float(),
+            *(topk_metrics[k].compute().float() for k in topk_keys),
+        ])
+        host = [t.to("cpu", non_blocking=True) for t in (scalars_t, cm_metric.compute().to(torch.int32), fpr_t, tpr_t)]
+        if scalars_t.is_cuda:
+            torch.cuda.current_stream(scalars_t.device).synchronize()
+        scalars, cm, fpr, tpr = (h.numpy() for h in host)
+    finally:
+        _reset_eval_metrics(metrics)
+
+    total_loss_val, acc1, map, f1_val, auc_macro, cohenk, recall_mi, recall_ma = scalars[:8].tolist()
+    avg_loss = total_loss_val / max(nb, 1)
+    topk_vals = dict(zip(topk_keys, scalars[8:].tolist()))
 
     print(
         f"[EVAL epoch {epoch+1}] loss={avg_loss:.4f} acc@1={acc1:.4f} map={map:.4f} "
@@ -213,28 +333,19 @@ def evaluate(
     )
 
     # --- Visuals: Confusion Matrix + ROC(micro) ---
+    # Rendered on a background thread; the next evaluate() (or the runner's
+    # wait_for_pending_figures) waits for it.
     class_names = [id2label[i] for i in range(num_classes)]
     figure_paths = []
     if fig_dir is not None:
-        os.makedirs(fig_dir, exist_ok=True)
-
-        cm_fig = plot_confusion_matrix(cm, class_names, title=f"{log_prefix.upper()} Confusion Matrix (epoch {epoch+1})")
         cm_path = os.path.join(fig_dir, f"{log_prefix}_confusion_matrix_epoch_{epoch+1}.png")
-        save_figure(cm_fig, cm_path)
-        figure_paths.append(cm_path)
-
-        roc_fig = plot_roc_micro(fpr, tpr, auc_macro, title=f"{log_prefix.upper()} ROC (micro) epoch {epoch+1}")
         roc_path = os.path.join(fig_dir, f"{log_prefix}_roc_micro_epoch_{epoch+1}.png")
-        save_figure(roc_fig, roc_path)
-        figure_paths.append(roc_path)
-
-        # Also log figures to TensorBoard
-        if tb_writer is not None:
-            import matplotlib.pyplot as plt
-            # Re-create lightweight figures for TB to avoid reusing closed figs
-            tb_writer.add_figure(f"{log_prefix}/confusion_matrix", plot_confusion_matrix(cm, class_names), global_step=epoch)
-            tb_writer.add_figure(f"{log_prefix}/roc_micro", plot_roc_micro(fpr, tpr, auc_macro), global_step=epoch)
-            plt.close('all')
+        figure_paths = [cm_path, roc_path]
+        global _pending_figures
+        _pending_figures = _FIG_EXECUTOR.submit(
+            _render_and_log_figures,
+            cm, class_names, fpr, tpr, auc_macro, epoch, log_prefix, cm_path, roc_path, tb_writer,
+        )
 
     return {
         "val_loss": avg_loss,
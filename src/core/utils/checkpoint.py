@@ -1,11 +1,134 @@
 import os
 import json
+import shutil
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Tuple, Optional, Dict, Any
 import torch
 from shared.logging.config import get_logger
 
 logger = get_logger("core.checkpoint")
 
+# Checkpoint files are written by a single background thread so the next epoch
+# can start while the previous one is flushed to disk. At most one write is in
+# flight; the next save (or wait_for_pending_checkpoint) waits for it.
+_WRITER = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ckpt-writer")
+_pending_write: Optional[Future] = None
+
+def wait_for_pending_checkpoint() -> None:
+    """Block until the in-flight checkpoint write (if any) is on disk.
+
+    Re-raises any error the background write hit.
+    """
+    global _pending_write
+    fut, _pending_write = _pending_write, None
+    if fut is not None:
+        fut.result()
+
+# Parsed _best_meta.json per meta path, tagged with the file's (mtime_ns, size)
+# when it was read or written. Later epochs reuse it as long as the file on disk
+# is unchanged; a deleted or rewritten file (e.g. a reused ckpt_dir) is re-read.
+_BEST_META: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+
+def _file_signature(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+def _load_best_meta(meta_path: str) -> Optional[Dict[str, Any]]:
+    sig = _file_signature(meta_path)
+    if sig is None:
+        _BEST_META.pop(meta_path, None)
+        return None
+    cached = _BEST_META.get(meta_path)
+    if cached is not None and cached[0] == sig:
+        meta = cached[1]
+    else:
+        try:
+            with open(meta_path, "r") as f:
+                meta = json.load(f)
+        except Exception as e:
+            logger.warning(
+                "Failed to load checkpoint metadata - may be corrupted",
+                extra={"meta_path": meta_path, "error": str(e)}
+            )
+            return None
+        _BEST_META[meta_path] = (sig, meta)
+    # Metadata for a best checkpoint that is gone would block saving a new one
+    best_ckpt = meta.get("best_ckpt")
+    if best_ckpt and not os.path.isfile(best_ckpt):
+        logger.warning(
+            "Best checkpoint referenced by metadata is missing; ignoring previous best",
+            extra={"meta_path": meta_path, "best_ckpt": best_ckpt}
+        )
+        return None
+    return meta
+
+# Pinned host buffers for GPU tensors, keyed by their path in the payload and
+# reused across epochs. Safe because a new snapshot is only taken once the
+# previous write (which serializes these buffers) has finished.
+_STAGING: Dict[Tuple[Any, ...], torch.Tensor] = {}
+_COPY_STREAMS: Dict[torch.device, "torch.cuda.Stream"] = {}
+
+def reset_checkpoint_state() -> None:
+    """Drop per-run checkpoint caches (pinned staging buffers, copy streams, best metadata).
+
+    Call once a run is finished and wait_for_pending_checkpoint() has
+    returned; long-lived processes otherwise keep page-locked host memory
+    for every architecture they have trained.
+    """
+    _STAGING.clear()
+    _COPY_STREAMS.clear()
+    _BEST_META.clear()
+
+def _staging_buffer(key: Tuple[Any, ...], t: torch.Tensor) -> torch.Tensor:
+    buf = _STAGING.get(key)
+    if buf is None or buf.shape != t.shape or buf.dtype != t.dtype:
+        buf = torch.empty(t.shape, dtype=t.dtype, device="cpu", pin_memory=True)
+        _STAGING[key] = buf
+    return buf
+
+def _copy_stream(device: torch.device) -> "torch.cuda.Stream":
+    stream = _COPY_STREAMS.get(device)
+    if stream is None:
+        stream = torch.cuda.Stream(device=device)
+        _COPY_STREAMS[device] = stream
+    return stream
+
+def _snapshot(obj: Any, key: Tuple[Any, ...], streams: Dict[torch.device, "torch.cuda.Stream"]) -> Any:
+    if isinstance(obj, torch.Tensor):
+        t = obj.detach()
+        if not t.is_cuda:
+            return t.to("cpu", copy=True)
+        stream = streams.get(t.device)
+        if stream is None:
+            # Order the side-stream copies after the work already queued on the device
+            stream = _copy_stream(t.device)
+            stream.wait_stream(torch.cuda.current_stream(t.device))
+            streams[t.device] = stream
+        buf = _staging_buffer(key, t)
+        with torch.cuda.stream(stream):
+            buf.copy_(t, non_blocking=True)
+        return buf
+    if isinstance(obj, dict):
+        return {k: _snapshot(v, key + (k,), streams) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return type(obj)(_snapshot(v, key + (i,), streams) for i, v in enumerate(obj))
+    return obj
+
+def _snapshot_to_host(states: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy tensors in (nested) state dicts to CPU so training can keep mutating the originals.
+
+    GPU tensors are copied asynchronously into reused pinned buffers on a side
+    stream per device, followed by a single synchronize.
+    """
+    streams: Dict[torch.device, "torch.cuda.Stream"] = {}
+    out = {name: _snapshot(state, (name,), streams) for name, state in states.items()}
+    for stream in streams.values():
+        stream.synchronize()
+    return out
+
 def _is_improved(curr: float, best: Optional[float], mode: str) -> bool:
     if best is None:
         return True
@@ -13,6 +136,57 @@ def _is_improved(curr: float, best: Optional[float], mode: str) -> bool:
         raise ValueError(f"mode must be 'max' or 'min', got {mode}")
     return (curr > best) if mode == "max" else (curr < best)
 
+def _save_atomic(payload: Dict[str, Any], path: str) -> None:
+    """torch.save through a large buffered temp file, then rename into place.
+
+    Never writes into an existing file, which may be a hardlink shared with
+    another checkpoint.
+    """
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb", buffering=16 << 20) as f:
+        torch.save(payload, f, pickle_protocol=5)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def _write_json_atomic(obj: Dict[str, Any], path: str) -> None:
+    """json.dump to a temp file, fsync, then rename into place."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(obj, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def _link_or_copy(src: str, dst: str) -> None:
+    """Point ``dst`` at the bytes of ``src`` (hardlink, copy across filesystems)."""
+    tmp_path = dst + ".tmp"
+    if os.path.lexists(tmp_path):
+        os.remove(tmp_path)
+    try:
+        os.link(src, tmp_path)
+    except OSError:
+        shutil.copyfile(src, tmp_path)
+        with open(tmp_path, "rb") as f:
+            os.fsync(f.fileno())
+    os.replace(tmp_path, dst)
+
+def _prune_epoch_checkpoint(ckpt_dir: str, epoch_idx: int) -> None:
+    """Remove ``epoch_{epoch_idx:03d}.pt`` if present.
+
+    Safe for the best checkpoint: it is a hardlink (or copy), so it keeps its data.
+    """
+    path = os.path.join(ckpt_dir, f"epoch_{epoch_idx:03d}.pt")
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.warning(
+            "Failed to remove old epoch checkpoint",
+            extra={"path": path, "error": str(e)}
+        )
+
 def save_model_checkpoints(
     *,
     model: torch.nn.Module,
@@ -25,14 +199,28 @@ def save_model_checkpoints(
     monitor: str = "val_acc@1",
     mode: str = "max",
     best_ckpt_name: str = "best.pt",
+    keep_last_epoch_checkpoints: int = 0,
+    save_optimizer_state: bool = False,
 ) -> Tuple[Optional[float], bool, str, Optional[str]]:
     """
     Saves:
       1) a per-epoch checkpoint:  <ckpt_dir>/epoch_{epoch+1:03d}.pt
       2) the best-so-far checkpoint (overwrites): <ckpt_dir>/<best_ckpt_name>
 
+    Every file is written to a temp path, fsynced and renamed into place, so a
+    crash never leaves a truncated checkpoint behind. With
+    ``keep_last_epoch_checkpoints`` > 0 only that many per-epoch files are kept.
+    Optimizer state is always kept in the best checkpoint (for resuming); plain
+    per-epoch checkpoints only carry it with ``save_optimizer_state``.
+
+    The state is snapshotted to CPU here; files are written in the background.
+    Call wait_for_pending_checkpoint() before relying on them being on disk.
+
     Returns: (best_value, is_best, best_ckpt_path, epoch_ckpt_path)
     """
+    global _pending_write
+    # The previous write owns the meta file; let it finish before reading it
+    wait_for_pending_checkpoint()
     os.makedirs(ckpt_dir, exist_ok=True)
 
     # --- determine current score ---
@@ -50,65 +238,68 @@ def save_model_checkpoints(
     # --- read previous best from meta file (if any) ---
     meta_path = os.path.join(ckpt_dir, "_best_meta.json")
     best_value: Optional[float] = None
-    if os.path.isfile(meta_path):
+    meta = _load_best_meta(meta_path)
+    if meta is not None and meta.get("monitor") == monitor and meta.get("mode") == mode:
         try:
-            with open(meta_path, "r") as f:
-                meta = json.load(f)
-            if meta.get("monitor") == monitor and meta.get("mode") == mode:
-                best_value = float(meta.get("best_value"))
-        except Exception as e:
+            best_value = float(meta.get("best_value"))
+        except (TypeError, ValueError) as e:
             logger.warning(
-                "Failed to load checkpoint metadata - may be corrupted",
+                "Checkpoint metadata has an invalid best_value",
                 extra={"meta_path": meta_path, "error": str(e)}
             )
 
-    # --- save per-epoch checkpoint ---
+    # --- build the payload once; state dicts are materialized a single time ---
     epoch_idx = epoch + 1  # human-friendly
+    is_best = _is_improved(curr_value, best_value, mode)
+    payload: Dict[str, Any] = {}
+    if save_per_epoch_checkpoint or is_best:
+        payload = _snapshot_to_host({
+            "model_state": model.state_dict(),
+            "optimizer_state": optimizer.state_dict() if (optimizer is not None and (is_best or save_optimizer_state)) else None,
+            "scheduler_state": scheduler.state_dict() if (scheduler is not None and hasattr(scheduler, "state_dict")) else None,
+        })
+        payload.update({
+            "epoch": epoch_idx,
+            "eval_metrics": eval_metrics,
+            "monitor": monitor,
+            "mode": mode,
+        })
+        if is_best:
+            payload["best_value"] = curr_value
 
     epoch_ckpt_path = None
     if save_per_epoch_checkpoint:
         epoch_ckpt_path = os.path.join(ckpt_dir, f"epoch_{epoch_idx:03d}.pt")
-        torch.save(
-            {
-                "epoch": epoch_idx,
-                "model_state": model.state_dict(),
-                "optimizer_state": optimizer.state_dict() if optimizer is not None else None,
-                "scheduler_state": scheduler.state_dict() if (scheduler is not None and hasattr(scheduler, "state_dict")) else None,
-                "eval_metrics": eval_metrics,
-                "monitor": monitor,
-                "mode": mode,
-            },
-            epoch_ckpt_path,
-        )
-
-    # --- if improved, overwrite best checkpoint ---
-    is_best = _is_improved(curr_value, best_value, mode)
     best_ckpt_path = os.path.join(ckpt_dir, best_ckpt_name)
-    if is_best:
-        torch.save(
-            {
+
+    def _write() -> None:
+        # --- save per-epoch checkpoint ---
+        if epoch_ckpt_path is not None:
+            _save_atomic(payload, epoch_ckpt_path)
+
+        # --- if improved, overwrite best checkpoint (reusing the epoch file when written) ---
+        if is_best:
+            if epoch_ckpt_path is not None:
+                _link_or_copy(epoch_ckpt_path, best_ckpt_path)
+            else:
+                _save_atomic(payload, best_ckpt_path)
+            meta = {
+                "best_value": curr_value,
                 "epoch": epoch_idx,
-                "model_state": model.state_dict(),
-                "optimizer_state": optimizer.state_dict() if optimizer is not None else None,
-                "scheduler_state": scheduler.state_dict() if (scheduler is not None and hasattr(scheduler, "state_dict")) else None,
-                "eval_metrics": eval_metrics,
                 "monitor": monitor,
                 "mode": mode,
-                "best_value": curr_value,
-            },
-            best_ckpt_path,
-        )
-        with open(meta_path, "w") as f:
-            json.dump(
-                {
-                    "best_value": curr_value,
-                    "epoch": epoch_idx,
-                    "monitor": monitor,
-                    "mode": mode,
-                    "best_ckpt": best_ckpt_path,
-                },
-                f,
-                indent=2,
-            )
+                "best_ckpt": best_ckpt_path,
+            }
+            _write_json_atomic(meta, meta_path)
+            sig = _file_signature(meta_path)
+            if sig is not None:
+                _BEST_META[meta_path] = (sig, meta)
+
+        # --- rolling window of per-epoch checkpoints ---
+        if epoch_ckpt_path is not None and keep_last_epoch_checkpoints > 0:
+            _prune_epoch_checkpoint(ckpt_dir, epoch_idx - keep_last_epoch_checkpoints)
+
+    if payload:
+        _pending_write = _WRITER.submit(_write)
 
     return (curr_value if is_best else best_value, is_best, best_ckpt_path, epoch_ckpt_path)
@@ -1,22 +1,55 @@
 import torch
 from collections import abc
 from typing import Any, Mapping, Sequence
+from shared.logging.config import get_logger
 
-def _move_to_device(x: Any, device: torch.device, dtype=None, non_blocking=True):
-    """Recursively move tensors to device/dtype, preserving structure."""
+logger = get_logger("core.cuda_helper")
+
+def _move_to_device(x: Any, device: torch.device, dtype=None, non_blocking=True, transfer_dtype=None):
+    """Recursively move tensors to device/dtype, preserving structure.
+
+    With ``transfer_dtype`` set, floating-point tensors are narrowed to it before
+    the copy so fewer bytes cross PCIe; integer tensors (uint8 images, labels)
+    always travel in their native dtype. ``dtype`` is applied on the device.
+    """
     if isinstance(x, torch.Tensor):
-        return x.to(device=device, dtype=dtype if dtype is not None else x.dtype, non_blocking=non_blocking)
+        if transfer_dtype is not None and x.is_floating_point() and x.dtype != transfer_dtype:
+            x = x.to(dtype=transfer_dtype)
+        x = x.to(device=device, non_blocking=non_blocking)
+        return x if dtype is None else x.to(dtype=dtype)
     elif isinstance(x, Mapping):
-        return {k: _move_to_device(v, device, dtype, non_blocking) for k, v in x.items()}
+        return {k: _move_to_device(v, device, dtype, non_blocking, transfer_dtype) for k, v in x.items()}
     elif isinstance(x, tuple) and hasattr(x, "_fields"):  # namedtuple
-        return type(x)(*(_move_to_device(v, device, dtype, non_blocking) for v in x))
+        return type(x)(*(_move_to_device(v, device, dtype, non_blocking, transfer_dtype) for v in x))
     elif isinstance(x, Sequence) and not isinstance(x, (str, bytes)):
         typ = type(x)
-        return typ(_move_to_device(v, device, dtype, non_blocking) for v in x)
+        return typ(_move_to_device(v, device, dtype, non_blocking, transfer_dtype) for v in x)
     else:
         return x  # leave non-tensors as-is
 
 
+def _record_stream(x: Any, stream) -> None:
+    """Mark every tensor in a (nested) batch as in use on ``stream``."""
+    if isinstance(x, torch.Tensor):
+        x.record_stream(stream)
+    elif isinstance(x, Mapping):
+        for v in x.values():
+            _record_stream(v, stream)
+    elif isinstance(x, Sequence) and not isinstance(x, (str, bytes)):
+        for v in x:
+            _record_stream(v, stream)
+
+
+def _is_tensor_pair(batch: Any) -> bool:
+    """Whether ``batch`` is the plain ``(inputs, labels)`` shape our collate_fn yields."""
+    return (
+        type(batch) in (tuple, list)
+        and len(batch) == 2
+        and type(batch[0]) is torch.Tensor
+        and type(batch[1]) is torch.Tensor
+    )
+
+
 class CUDAPrefetchLoader:
     """
     Wrap a DataLoader to prefetch the *next* batch to GPU asynchronously.
@@ -29,14 +62,31 @@ class CUDAPrefetchLoader:
         loader: torch.utils.data.DataLoader
         device: torch.device or string like 'cuda:0' (default: current cuda device)
         dtype: optional target dtype (e.g., torch.float16 for fp16 inputs)
-        non_blocking: use non_blocking=True for .to() copies (use with pin_memory=True on DataLoader)
+        non_blocking: use non_blocking=True for .to() copies. Copies are only truly
+            asynchronous from pinned memory, so keep pin_memory=True on the DataLoader
+            (build_dataloaders does)
+        transfer_dtype: optional storage dtype for floating-point tensors on the wire
+            (e.g. torch.bfloat16). Images built by build_dataloaders are already
+            uint8 and are copied as-is; the GPU pipeline upcasts them. Note the
+            narrowing cast runs on the host and yields unpinned memory, so prefer
+            casting in the collate_fn when the loader produces float batches.
+        batch_fn: optional callable that takes the raw CPU batch and returns the
+            device batch (e.g. GPU image decoding); it replaces the plain copy and
+            runs on the prefetch stream
     """
-    def __init__(self, loader, device=None, dtype=None, non_blocking=True):
+    def __init__(self, loader, device=None, dtype=None, non_blocking=True, batch_fn=None, transfer_dtype=None):
         self.loader = loader
         self.dtype = dtype
         self.non_blocking = non_blocking
+        self.transfer_dtype = transfer_dtype
+        self.batch_fn = batch_fn
 
         self._use_cuda = torch.cuda.is_available()
+        if self._use_cuda and non_blocking and not getattr(loader, "pin_memory", True):
+            # Copies from pageable memory are staged synchronously by the driver
+            logger.warning(
+                "DataLoader has pin_memory=False; non_blocking H2D copies will not overlap compute"
+            )
         if self._use_cuda:
             self.device = torch.device(device) if device is not None else torch.device("cuda", torch.cuda.current_device())
             self.stream = torch.cuda.Stream(device=self.device)
@@ -46,6 +96,9 @@ class CUDAPrefetchLoader:
 
         self._iter = None
         self._next = None
+        # Set on the first batch: whether batches are plain (Tensor, Tensor) pairs
+        # that can skip the generic recursive walk
+        self._pair_fast_path = None
 
     def __len__(self):
         return len(self.loader)
@@ -57,18 +110,30 @@ class CUDAPrefetchLoader:
             return
 
         self._iter = iter(self.loader)
-        self._preload()
-        while self._next is not None:
-            # Make sure the current stream waits for the prefetch stream
-            torch.cuda.current_stream(self.device).wait_stream(self.stream)
-            batch = self._next
-            # Immediately kick off copy for the following batch
+        try:
             self._preload()
-            yield batch
-
-        # clean up references
-        self._iter = None
-        self._next = None
+            while self._next is not None:
+                # Make sure the current stream waits for the prefetch stream: this is
+                # what orders compute after the copy (record_stream alone does not)
+                consumer = torch.cuda.current_stream(self.device)
+                consumer.wait_stream(self.stream)
+                batch = self._next
+                # The batch was allocated on the prefetch stream but is used on the
+                # consumer stream; tell the caching allocator so its memory is not
+                # reused by a later prefetch while compute still reads it
+                if self._pair_fast_path and _is_tensor_pair(batch):
+                    batch[0].record_stream(consumer)
+                    batch[1].record_stream(consumer)
+                else:
+                    _record_stream(batch, consumer)
+                # Immediately kick off copy for the following batch
+                self._preload()
+                yield batch
+        finally:
+            # clean up references (also when the consumer stops early, e.g. on
+            # cancellation, so the prefetched batch doesn't pin device memory)
+            self._iter = None
+            self._next = None
 
     def _preload(self):
         try:
@@ -77,23 +142,28 @@ class CUDAPrefetchLoader:
             self._next = None
             return
 
+        if self._pair_fast_path is None:
+            self._pair_fast_path = (
+                self.batch_fn is None
+                and self.dtype is None
+                and self.transfer_dtype is None
+                and _is_tensor_pair(nxt)
+            )
+
         # Do the H2D copies on the prefetch stream
         with torch.cuda.stream(self.stream):
-            self._next = _move_to_device(
-                nxt,
-                device=self.device,
-                dtype=self.dtype,
-                non_blocking=self.non_blocking,
-            )
-            # Optionally, you can also warm up by calling .record_stream on each tensor
-            # so that CUDA knows which stream "owns" it and can free memory earlier.
-            def _record_stream(x):
-                if isinstance(x, torch.Tensor):
-                    x.record_stream(self.stream)
-                elif isinstance(x, Mapping):
-                    for v in x.values():
-                        _record_stream(v)
-                elif isinstance(x, Sequence) and not isinstance(x, (str, bytes)):
-                    for v in x:
-                        _record_stream(v)
-            _record_stream(self._next)
+            if self._pair_fast_path and _is_tensor_pair(nxt):
+                self._next = (
+                    nxt[0].to(self.device, non_blocking=self.non_blocking),
+                    nxt[1].to(self.device, non_blocking=self.non_blocking),
+                )
+            elif self.batch_fn is not None:
+                self._next = self.batch_fn(nxt)
+            else:
+                self._next = _move_to_device(
+                    nxt,
+                    device=self.device,
+                    dtype=self.dtype,
+                    non_blocking=self.non_blocking,
+                    transfer_dtype=self.transfer_dtype,
+                )
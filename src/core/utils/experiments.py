@@ -9,12 +9,15 @@ import os
 from ..config import TrainConfig
 
 
+_SANITIZE_TABLE = str.maketrans({"/": "-", " ": "_"})
+
+
 def sanitize_name(s: str) -> str:
     """Return a filesystem-friendly string.
 
     Replaces slashes with dashes and spaces with underscores.
     """
-    return s.replace("/", "-").replace(" ", "_")
+    return s.translate(_SANITIZE_TABLE)
 
 
 def make_run_base(cfg: TrainConfig) -> str:
@@ -10,8 +10,27 @@ from torch.optim import Adam, AdamW
 from typing import Dict, Any, Optional, List
 
 
+# Layers whose weights are excluded from weight decay
+_NO_DECAY_MODULES = (
+    torch.nn.LayerNorm,
+    torch.nn.GroupNorm,
+    torch.nn.BatchNorm1d,
+    torch.nn.BatchNorm2d,
+    torch.nn.BatchNorm3d,
+    torch.nn.SyncBatchNorm,
+    torch.nn.InstanceNorm1d,
+    torch.nn.InstanceNorm2d,
+    torch.nn.InstanceNorm3d,
+    torch.nn.Embedding,
+)
+
+# Bare nn.Parameter embeddings (ViT position embeddings and class token, Swin
+# relative position bias), matched by parameter name since they have no module
+_NO_DECAY_NAMES = ("pos_embed", "position_embedding", "cls_token", "relative_position_bias_table")
+
+
 def build_param_groups(module: torch.nn.Module, weight_decay: float) -> List[Dict[str, Any]]:
-    """Build parameter groups to avoid weight decay on LayerNorm/bias.
+    """Build parameter groups to avoid weight decay on norms, biases and embeddings.
 
     This is important for stability when training ViT/Swin transformers.
 
@@ -22,12 +41,19 @@ def build_param_groups(module: torch.nn.Module, weight_decay: float) -> List[Dic
     Returns:
         List of parameter groups with appropriate weight decay settings
     """
+    # Parameters owned directly by normalization/embedding layers, by identity
+    no_decay_ids = set()
+    for submodule in module.modules():
+        if isinstance(submodule, _NO_DECAY_MODULES):
+            no_decay_ids.update(id(p) for p in submodule.parameters(recurse=False))
+
     decay_params, no_decay_params = [], []
     for name, param in module.named_parameters():
         if not param.requires_grad:
             continue
-        # Do not apply weight decay on bias, LayerNorm/Norms, or 1D parameters
-        if name.endswith("bias") or param.ndim == 1 or "norm" in name.lower() or "layernorm" in name.lower():
+        # Do not apply weight decay on bias, norm/embedding weights, or 1D parameters
+        if (id(param) in no_decay_ids or param.ndim == 1 or name.endswith("bias")
+                or any(key in name for key in _NO_DECAY_NAMES)):
             no_decay_params.append(param)
         else:
             decay_params.append(param)
@@ -37,6 +63,12 @@ def build_param_groups(module: torch.nn.Module, weight_decay: float) -> List[Dic
     ]
 
 
+def _can_use_fused(param_groups: List[Dict[str, Any]]) -> bool:
+    """Fused Adam/AdamW kernels need every parameter to be a floating CUDA tensor."""
+    params = [p for group in param_groups for p in group["params"]]
+    return bool(params) and all(p.is_cuda and p.is_floating_point() for p in params)
+
+
 def build_optimizer(
     optimizer_name: str,
     model: torch.nn.Module,
@@ -65,14 +97,14 @@ def build_optimizer(
         param_groups = build_param_groups(model, weight_decay)
         betas = optimizer_params.get('betas', [0.9, 0.999])
         eps = optimizer_params.get('eps', 1e-8)
-        return AdamW(param_groups, lr=lr, betas=betas, eps=eps)
+        return AdamW(param_groups, lr=lr, betas=betas, eps=eps, fused=_can_use_fused(param_groups))
 
     elif optimizer_name == 'adam':
         # Preserve previous behavior: no weight decay when using Adam
         param_groups = build_param_groups(model, 0.0)
         betas = optimizer_params.get('betas', [0.9, 0.999])
         eps = optimizer_params.get('eps', 1e-8)
-        return Adam(param_groups, lr=lr, betas=betas, eps=eps)
+        return Adam(param_groups, lr=lr, betas=betas, eps=eps, fused=_can_use_fused(param_groups))
 
     else:
         raise ValueError(f"Unsupported optimizer: {optimizer_name}. "
@@ -179,6 +179,19 @@ class GPUTransformRegistry(Registry):
             tags=['safe', 'advanced']
         ))
 
+        # Intensity transforms (applied to normalized batches)
+        self.register('RandomGaussianNoise', TransformSpec(
+            name='RandomGaussianNoise',
+            description='Add Gaussian noise to the normalized image batch',
+            parameters=[
+                ParameterSpec('mean', 'float', 'Mean of the noise', 0.0, -1.0, 1.0, required=False),
+                ParameterSpec('std', 'float', 'Standard deviation of the noise', 0.05, 0.0, 1.0, required=False),
+                ParameterSpec('p', 'float', 'Probability of applying noise', 0.5, 0.0, 1.0, required=False)
+            ],
+            category='noise',
+            tags=['advanced']
+        ))
+
 
 class GPUPresetRegistry(Registry):
     """Registry for GPU augmentation presets."""
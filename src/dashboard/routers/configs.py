@@ -4,14 +4,17 @@ import hashlib
 
 from shared.database.connection import get_db
 from shared.database import models
-from shared.database.schemas import TrainConfigCreate, TrainConfigOut, TrainConfigUpdate
+from shared.database.schemas import TrainConfigCreate, TrainConfigOut, TrainConfigUpdate, CONFIG_OUT_LIST_ADAPTER
+
+from ..utils import orm_json_response
 
 router = APIRouter(prefix="/configs", tags=["configs"])
 
 
 @router.get("/project/{project_id}", response_model=list[TrainConfigOut])
 def list_configs(project_id: str, db: Session = Depends(get_db)):
-    return db.query(models.TrainConfigModel).filter(models.TrainConfigModel.project_id == project_id).order_by(models.TrainConfigModel.created_at.desc()).all()
+    rows = db.query(models.TrainConfigModel).filter(models.TrainConfigModel.project_id == project_id).order_by(models.TrainConfigModel.created_at.desc()).all()
+    return orm_json_response(CONFIG_OUT_LIST_ADAPTER, rows)
 
 
 @router.post("", response_model=TrainConfigOut)
@@ -22,7 +22,7 @@ def create_group(payload: GroupCreate, db: Session = Depends(get_db)):
         project_id=payload.project_id,
         name=payload.name,
         description=payload.description,
-        tags=payload.tags or [],
+        tags=list(payload.tags or ()),
     )
     db.add(grp)
     db.commit()
@@ -3,14 +3,16 @@ from sqlalchemy.orm import Session
 
 from shared.database.connection import get_db
 from shared.database import models
-from shared.database.schemas import ProjectCreate, ProjectUpdate, ProjectOut
+from shared.database.schemas import ProjectCreate, ProjectUpdate, ProjectOut, PROJECT_OUT_LIST_ADAPTER
+
+from ..utils import orm_json_response
 
 router = APIRouter(prefix="/projects", tags=["projects"])
 
 
 @router.get("", response_model=list[ProjectOut])
 def list_projects(db: Session = Depends(get_db)):
-    return db.query(models.Project).order_by(models.Project.created_at.desc()).all()
+    return orm_json_response(PROJECT_OUT_LIST_ADAPTER, db.query(models.Project).order_by(models.Project.created_at.desc()).all())
 
 
 @router.post("", response_model=ProjectOut)
@@ -7,9 +7,9 @@ from sqlalchemy.orm import Session
 
 from shared.database.connection import get_db
 from shared.database import models
-from shared.database.schemas import RunCreate, RunOut
+from shared.database.schemas import RunCreate, RunOut, RUN_OUT_LIST_ADAPTER
 from .ws import ws_manager
-from ..utils import resolve_run_name
+from ..utils import orm_json_response, resolve_run_name
 from core.utils.experiments import unique_run_name
 from ..tensorboard import get_embedded_url_path
 
@@ -27,7 +27,7 @@ def list_runs(
         q = q.filter(models.Run.project_id == project_id)
     if state:
         q = q.filter(models.Run.state == state)
-    return q.order_by(models.Run.created_at.desc()).all()
+    return orm_json_response(RUN_OUT_LIST_ADAPTER, q.order_by(models.Run.created_at.desc()).all())
 
 
 @router.get("/{run_id}", response_model=RunOut)
@@ -102,7 +102,7 @@ async def create_run_from_config(config_id: str, payload: RunCreate, db: Session
         seed=cfg.config_json.get("seed"),
         log_dir=effective_log_root,
         ckpt_dir=effective_ckpt_root,
-        gpu_indices=payload.gpu_indices or [],
+        gpu_indices=list(payload.gpu_indices),
     )
     db.add(run)
     db.commit()
@@ -300,7 +300,7 @@ def tensorboard_url(run_id: str, db: Session = Depends(get_db)):
 def _serialize_run(run: models.Run) -> dict:
     return {
         "id": str(run.id),
-        "project_id": str(run.project_id) if run.project_id else None,
+        "project_id": str(run.project_id),
         "config_id": str(run.config_id) if run.config_id else None,
         "group_id": str(run.group_id) if run.group_id else None,
         "name": run.name,
@@ -317,8 +317,8 @@ def _serialize_run(run: models.Run) -> dict:
         "seed": run.seed,
         "log_dir": run.log_dir,
         "ckpt_dir": run.ckpt_dir,
-        "created_at": run.created_at.isoformat() if run.created_at else None,
-        "updated_at": run.updated_at.isoformat() if run.updated_at else None,
+        "created_at": run.created_at.isoformat(),
+        "updated_at": run.updated_at.isoformat(),
         "gpu_indices": run.gpu_indices or [],
     }
 
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session, selectinload
 from sqlalchemy import and_, or_, text
 from typing import List, Optional
@@ -29,11 +30,21 @@ def _calculate_level(parent: Optional[models.Tag]) -> int:
     return parent.level + 1
 
 
+def _descendants_of(path: str):
+    """Filter matching strict descendants of ``path`` by materialized path.
+
+    The pattern is a constant, escaped prefix so it can use the path index and
+    tag names containing ``%`` or ``_`` don't match unrelated tags.
+    """
+    escaped = path.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return models.Tag.path.like(f"{escaped}/%", escape="\\")
+
+
 def _update_descendants_paths(db: Session, tag: models.Tag, old_path: str) -> None:
     """Update materialized paths for all descendants when a tag is moved"""
     # Find all descendants with paths starting with the old path
     descendants = db.query(models.Tag).filter(
-        models.Tag.path.like(f"{old_path}/%")
+        _descendants_of(old_path)
     ).all()
 
     for descendant in descendants:
@@ -64,6 +75,27 @@ def _check_circular_reference(db: Session, tag_id: UUID, new_parent_id: UUID) ->
     return potential_parent.path.startswith(f"{tag.path}/")
 
 
+def _build_tag_tree(tags: List[models.Tag]) -> List[dict]:
+    """Build a nested tag tree in one linear pass over path-ordered tags.
+
+    Nodes are plain JSON-ready dicts, so the recursive TagWithChildren model
+    is only used to document the response shape, never to validate it.
+    """
+    nodes: dict = {}
+    roots: List[dict] = []
+    for tag in tags:
+        node = TagOut.model_validate(tag).model_dump(mode="json")
+        node["children"] = []
+        nodes[tag.id] = node
+        if tag.parent_id is None:
+            roots.append(node)
+        else:
+            parent = nodes.get(tag.parent_id)
+            if parent is not None:
+                parent["children"].append(node)
+    return roots
+
+
 @router.post("", response_model=TagOut)
 async def create_tag(tag_data: TagCreate, db: Session = Depends(get_db)):
     """Create a new tag"""
@@ -124,22 +156,7 @@ def get_tag_tree(project_id: Optional[UUID] = Query(None), db: Session = Depends
     # Get all tags ordered by path for proper tree building
     all_tags = query.order_by(models.Tag.path).all()
 
-    # Build tree structure
-    tag_map = {}
-    root_tags = []
-
-    for tag in all_tags:
-        tag_dict = TagWithChildren.model_validate(tag).model_dump()
-        tag_dict["children"] = []
-        tag_map[tag.id] = tag_dict
-
-        if tag.parent_id is None:
-            root_tags.append(tag_dict)
-        else:
-            if tag.parent_id in tag_map:
-                tag_map[tag.parent_id]["children"].append(tag_dict)
-
-    return root_tags
+    return JSONResponse(content=_build_tag_tree(all_tags))
 
 
 @router.get("/project/{project_id}", response_model=List[TagOut])
@@ -170,22 +187,7 @@ def get_project_tag_tree(project_id: UUID, db: Session = Depends(get_db)):
         models.Tag.project_id == project_id
     ).order_by(models.Tag.path).all()
 
-    # Build tree structure
-    tag_map = {}
-    root_tags = []
-
-    for tag in all_tags:
-        tag_dict = TagWithChildren.model_validate(tag).model_dump()
-        tag_dict["children"] = []
-        tag_map[tag.id] = tag_dict
-
-        if tag.parent_id is None:
-            root_tags.append(tag_dict)
-        else:
-            if tag.parent_id in tag_map:
-                tag_map[tag.parent_id]["children"].append(tag_dict)
-
-    return root_tags
+    return JSONResponse(content=_build_tag_tree(all_tags))
 
 
 @router.get("/{tag_id}", response_model=TagOut)
@@ -229,7 +231,7 @@ def get_tag_descendants(tag_id: UUID, db: Session = Depends(get_db)):
 
     # Get all descendants using materialized path
     descendants = db.query(models.Tag).filter(
-        models.Tag.path.like(f"{tag.path}/%")
+        _descendants_of(tag.path)
     ).order_by(models.Tag.path).all()
 
     return descendants
@@ -430,7 +432,7 @@ def get_tag_stats(tag_id: UUID, db: Session = Depends(get_db)):
     # Count total runs including descendants
     descendant_ids = [tag_id]
     descendants = db.query(models.Tag).filter(
-        models.Tag.path.like(f"{tag.path}/%")
+        _descendants_of(tag.path)
     ).all()
     descendant_ids.extend([d.id for d in descendants])
 
@@ -528,7 +530,7 @@ def get_runs_by_tag(
     if include_descendants:
         # Include all descendant tags
         descendants = db.query(models.Tag).filter(
-            models.Tag.path.like(f"{tag.path}/%")
+            _descendants_of(tag.path)
         ).all()
         tag_ids.extend([d.id for d in descendants])
 
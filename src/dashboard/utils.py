@@ -1,10 +1,29 @@
 from __future__ import annotations
 
 import os
+from functools import lru_cache
+from typing import Any, Iterable
 
+from fastapi import Response
+from pydantic import TypeAdapter
 
+
+_SANITIZE_TABLE = str.maketrans({"/": "-", " ": "_"})
+
+
+@lru_cache(maxsize=4096)
 def sanitize_name(s: str) -> str:
-    return s.replace("/", "-").replace(" ", "_")
+    return s.translate(_SANITIZE_TABLE)
+
+
+def orm_json_response(adapter: TypeAdapter, rows: Iterable[Any]) -> Response:
+    """Serialize ORM rows straight to JSON bytes through a prebuilt adapter.
+
+    Skips FastAPI's response_model re-validation; the route's response_model
+    is still used for the OpenAPI schema.
+    """
+    items = adapter.validate_python(list(rows), from_attributes=True)
+    return Response(content=adapter.dump_json(items), media_type="application/json")
 
 
 def resolve_run_name(cfg_json: dict) -> str:
@@ -14,10 +33,17 @@ def resolve_run_name(cfg_json: dict) -> str:
     not enforced at filesystem level here; the training code will ensure it
     when writing logs.
     """
-    model = sanitize_name(cfg_json.get("model_flavour", "model"))
-    loss = cfg_json.get("loss_name", "loss")
-    init = "pretrained" if cfg_json.get("load_pretrained", True) else "scratch"
-    suffix = cfg_json.get("model_suffix", "")
-    base = f"{model}__{loss}__{init}{suffix}"
-    return base
+    return _resolve_run_name(
+        cfg_json.get("model_flavour", "model"),
+        cfg_json.get("loss_name", "loss"),
+        bool(cfg_json.get("load_pretrained", True)),
+        cfg_json.get("model_suffix", ""),
+    )
+
+
+@lru_cache(maxsize=4096)
+def _resolve_run_name(model_flavour: str, loss: str, load_pretrained: bool, suffix: str) -> str:
+    model = sanitize_name(model_flavour)
+    init = "pretrained" if load_pretrained else "scratch"
+    return f"{model}__{loss}__{init}{suffix}"
 
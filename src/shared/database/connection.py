@@ -1,13 +1,38 @@
 from __future__ import annotations
 
+import logging
 import os
+import re
+import sys
+import time
 import uuid
 from datetime import datetime
 from typing import Generator
 
-from sqlalchemy import create_engine
+from sqlalchemy import JSON, DateTime, create_engine, inspect, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.schema import CreateIndex
+from sqlalchemy.sql.functions import FunctionElement
 from sqlalchemy.orm import sessionmaker, DeclarativeBase, Mapped, mapped_column
-from sqlalchemy.types import TypeDecorator, CHAR
+from sqlalchemy.types import TypeDecorator, CHAR, String
+
+
+logger = logging.getLogger(__name__)
+
+
+def uuid7() -> uuid.UUID:
+    """Return a time-ordered UUID version 7 (RFC 9562).
+
+    48-bit Unix millisecond timestamp followed by random bits, so new primary
+    keys land at the end of the index instead of at random positions. The
+    CHAR(36) text form sorts in the same order.
+    """
+    ts_ms = time.time_ns() // 1_000_000
+    value = (ts_ms & 0xFFFF_FFFF_FFFF) << 80 | int.from_bytes(os.urandom(10), "big")
+    value = (value & ~(0xF << 76)) | (0x7 << 76)  # version
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)  # RFC 4122 variant
+    return uuid.UUID(int=value)
 
 
 class GUID(TypeDecorator):
@@ -35,6 +60,49 @@ class GUID(TypeDecorator):
         return uuid.UUID(value)
 
 
+class InternedString(TypeDecorator):
+    """String column whose loaded values are interned.
+
+    For enum-like columns (states, levels, sources) with a handful of distinct
+    values, so every loaded row shares the same str objects.
+    """
+
+    impl = String
+    cache_ok = True
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return value
+        return sys.intern(value)
+
+
+# Plain JSON on SQLite; JSONB on Postgres, which is stored pre-parsed and
+# supports GIN indexes for containment queries.
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
+
+class utcnow(FunctionElement):
+    """Current UTC time as a naive timestamp, for server defaults.
+
+    Matches the naive UTC values datetime.utcnow writes from Python. Plain
+    now() on Postgres follows the session time zone.
+    """
+
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(utcnow)
+def _utcnow_default(element, compiler, **kw):
+    # SQLite's CURRENT_TIMESTAMP is already UTC
+    return "CURRENT_TIMESTAMP"
+
+
+@compiles(utcnow, "postgresql")
+def _utcnow_postgresql(element, compiler, **kw):
+    return "timezone('utc', now())"
+
+
 class TimestampMixin:
     created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -45,17 +113,167 @@ class Base(DeclarativeBase):
 
 
 DATABASE_URL = os.environ.get("DASHBOARD_DB_URL", "sqlite:///./dashboard.db")
+_IS_SQLITE = DATABASE_URL.startswith("sqlite")
+
+# Server databases get a small LIFO pool: hot connections are reused first so
+# overflow ones idle out, pre-ping drops connections the server has closed and
+# recycle keeps them under typical idle timeouts.
+_POOL_KWARGS = {} if _IS_SQLITE else {
+    "pool_size": 5,
+    "max_overflow": 5,
+    "pool_pre_ping": True,
+    "pool_use_lifo": True,
+    "pool_recycle": 1800,
+}
+
 engine = create_engine(
     DATABASE_URL,
-    connect_args={"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {},
+    connect_args={"check_same_thread": False} if _IS_SQLITE else {},
+    **_POOL_KWARGS,
 )
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 
+# Postgres NOTIFY channel announcing queued runs is RUN_NOTIFY_CHANNEL_PREFIX + agent id
+RUN_NOTIFY_CHANNEL_PREFIX = "new_run_"
+
+_RUN_NOTIFY_TRIGGERS_SQL = f"""
+CREATE OR REPLACE FUNCTION notify_run_queued() RETURNS trigger AS $$
+BEGIN
+    IF NEW.state = 'queued' AND NEW.agent_id IS NOT NULL
+       AND (TG_OP = 'INSERT' OR OLD.state IS DISTINCT FROM NEW.state) THEN
+        PERFORM pg_notify('{RUN_NOTIFY_CHANNEL_PREFIX}' || NEW.agent_id, NEW.id::text);
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION notify_job_enqueued() RETURNS trigger AS $$
+DECLARE
+    target_agent text;
+BEGIN
+    SELECT agent_id INTO target_agent FROM runs WHERE id = NEW.run_id AND state = 'queued';
+    IF target_agent IS NOT NULL THEN
+        PERFORM pg_notify('{RUN_NOTIFY_CHANNEL_PREFIX}' || target_agent, NEW.run_id::text);
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS runs_notify_queued ON runs;
+CREATE TRIGGER runs_notify_queued AFTER INSERT OR UPDATE OF state ON runs
+    FOR EACH ROW EXECUTE FUNCTION notify_run_queued();
+
+DROP TRIGGER IF EXISTS jobs_notify_enqueued ON jobs;
+CREATE TRIGGER jobs_notify_enqueued AFTER INSERT ON jobs
+    FOR EACH ROW EXECUTE FUNCTION notify_job_enqueued();
+"""
+
+
+# Indexes left unusable by a failed CREATE INDEX CONCURRENTLY
+_INVALID_INDEXES_SQL = """
+SELECT c.relname
+FROM pg_index i
+JOIN pg_class c ON c.oid = i.indexrelid
+JOIN pg_namespace n ON n.oid = c.relnamespace
+WHERE NOT i.indisvalid AND n.nspname = current_schema()
+"""
+
 
 def init_db() -> None:
     from . import models  # noqa: F401 ensure models are imported
 
     Base.metadata.create_all(bind=engine)
+    _create_missing_indexes()
+    _create_missing_server_defaults()
+    _install_run_notify_triggers()
+
+
+def _create_missing_indexes() -> None:
+    """Create model indexes that are missing on tables which already exist.
+
+    create_all() only emits indexes together with new tables, so databases
+    created by an older release never pick up indexes added later. On Postgres
+    they are built CONCURRENTLY to avoid locking busy tables; a concurrent
+    build that failed or was interrupted leaves an INVALID index behind, which
+    is dropped and rebuilt.
+    """
+    insp = inspect(engine)
+    existing_tables = set(insp.get_table_names())
+    concurrently = engine.dialect.name == "postgresql"
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        invalid = set()
+        if concurrently:
+            invalid = set(conn.execute(text(_INVALID_INDEXES_SQL)).scalars())
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            present = {ix["name"] for ix in insp.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name in present and index.name not in invalid:
+                    continue
+                try:
+                    if index.name in invalid:
+                        conn.execute(text(f'DROP INDEX CONCURRENTLY IF EXISTS "{index.name}"'))
+                        logger.warning("Dropped invalid index %s on %s", index.name, table.name)
+                    if concurrently:
+                        ddl = str(CreateIndex(index).compile(dialect=engine.dialect)).strip()
+                        conn.execute(text(re.sub(r"^CREATE (UNIQUE )?INDEX", r"CREATE \1INDEX CONCURRENTLY", ddl)))
+                    else:
+                        # Honours dialect-conditional indexes (ddl_if)
+                        index.create(bind=conn)
+                    logger.info("Created missing index %s on %s", index.name, table.name)
+                except Exception as exc:
+                    logger.warning("Could not create index %s on %s: %s", index.name, table.name, exc)
+
+
+def _create_missing_server_defaults() -> None:
+    """Add model server defaults missing on columns of existing tables.
+
+    Columns whose value moved from a Python default to a server default would
+    otherwise reject ORM inserts on databases created by an older release.
+    Only Postgres can alter a column default in place; other backends need
+    the table recreated, which is left to the operator.
+    """
+    insp = inspect(engine)
+    existing_tables = set(insp.get_table_names())
+    ddl_compiler = engine.dialect.ddl_compiler(engine.dialect, None)
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        reflected = {col["name"]: col.get("default") for col in insp.get_columns(table.name)}
+        for column in table.columns:
+            if column.server_default is None or column.name not in reflected or reflected[column.name] is not None:
+                continue
+            if engine.dialect.name != "postgresql":
+                # Left alone: recreating a user's table is a migration, not a startup step
+                logger.error(
+                    "Column %s.%s has no server default and inserts into %s will fail; "
+                    "recreate the table to add it",
+                    table.name, column.name, table.name,
+                )
+                continue
+            default_sql = ddl_compiler.get_column_default_string(column)
+            try:
+                with engine.begin() as conn:
+                    conn.execute(text(f'ALTER TABLE "{table.name}" ALTER COLUMN "{column.name}" SET DEFAULT {default_sql}'))
+                logger.info("Set server default on %s.%s", table.name, column.name)
+            except Exception as exc:
+                logger.warning("Could not set server default on %s.%s: %s", table.name, column.name, exc)
+
+
+def _install_run_notify_triggers() -> None:
+    """Install triggers that NOTIFY an agent when a run is queued for it.
+
+    Agents LISTEN on their channel to pick up new work immediately instead of
+    waiting for the next poll. Postgres only; elsewhere agents just poll.
+    """
+    if engine.dialect.name != "postgresql":
+        return
+    try:
+        with engine.begin() as conn:
+            conn.exec_driver_sql(_RUN_NOTIFY_TRIGGERS_SQL)
+    except Exception as exc:
+        logger.warning("Could not install run notification triggers: %s", exc)
 
 
 def get_db() -> Generator:
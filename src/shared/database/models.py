@@ -4,16 +4,16 @@ from datetime import datetime
 from typing import Optional
 import uuid
 
-from sqlalchemy import String, Integer, Boolean, ForeignKey, Text, JSON, Index, UniqueConstraint
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import String, Integer, Boolean, ForeignKey, Text, Index, UniqueConstraint, insert
+from sqlalchemy.orm import Mapped, Session, mapped_column, relationship
 
-from .connection import Base, GUID, TimestampMixin
+from .connection import Base, GUID, InternedString, JSONType, TimestampMixin, utcnow, uuid7
 
 
 class User(TimestampMixin, Base):
     __tablename__ = "users"
 
-    id: Mapped[uuid.UUID] = mapped_column(GUID(), primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(GUID(), primary_key=True, default=uuid7)
     email: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)
     name: Mapped[Optional[str]] = mapped_column(String(255))
     auth_provider: Mapped[Optional[str]] = mapped_column(String(50), default="local")
@@ -23,7 +23,7 @@ class User(TimestampMixin, Base):
 class Project(TimestampMixin, Base):
     __tablename__ = "projects"
 
-    id: Mapped[uuid.UUID] = mapped_column(GUID(), primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(GUID(), primary_key=True, default=uuid7)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     description: Mapped[Optional[str]] = mapped_column(Text)
 
@@ -35,11 +35,11 @@ class Project(TimestampMixin, Base):
 class ExperimentGroup(TimestampMixin, Base):
     __tablename__ = "experiment_groups"
 
-    id: Mapped[uuid.UUID] = mapped_column(GUID(), primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(GUID(), primary_key=True, default=uuid7)
     project_id: Mapped[uuid.UUID] = mapped_column(GUID(), ForeignKey("projects.id", ondelete="CASCADE"))
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     description: Mapped[Optional[str]] = mapped_column(Text)
-    tags: Mapped[Optional[list[str]]] = mapped_column(JSON, default=list)
+    tags: Mapped[Optional[list[str]]] = mapped_column(JSONType, default=list)
 
     project: Mapped[Project] = relationship(back_populates="groups")
 
@@ -51,31 +51,33 @@ class ExperimentGroup(TimestampMixin, Base):
 class TrainConfigModel(TimestampMixin, Base):
     __tablename__ = "train_configs"
 
-    id: Mapped[uuid.UUID] = mapped_column(GUID(), primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(GUID(), primary_key=True, default=uuid7)
     project_id: Mapped[uuid.UUID] = mapped_column(GUID(), ForeignKey("projects.id", ondelete="CASCADE"))
     group_id: Mapped[Optional[uuid.UUID]] = mapped_column(GUID(), ForeignKey("experiment_groups.id", ondelete="SET NULL"))
     name: Mapped[str] = mapped_column(String(255), nullable=False)
-    config_json: Mapped[dict] = mapped_column(JSON)
+    config_json: Mapped[dict] = mapped_column(JSONType)
     version: Mapped[int] = mapped_column(Integer, default=1)
-    status: Mapped[str] = mapped_column(String(20), default="ready")
+    status: Mapped[str] = mapped_column(InternedString(20), default="ready")
     hash: Mapped[Optional[str]] = mapped_column(String(64))
 
     __table_args__ = (
         Index("ix_configs_project_name", "project_id", "name"),
+        Index("ix_configs_hash", "hash"),
+        Index("ix_configs_json_gin", "config_json", postgresql_using="gin").ddl_if(dialect="postgresql"),
     )
 
 
 class Run(TimestampMixin, Base):
     __tablename__ = "runs"
 
-    id: Mapped[uuid.UUID] = mapped_column(GUID(), primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(GUID(), primary_key=True, default=uuid7)
     project_id: Mapped[uuid.UUID] = mapped_column(GUID(), ForeignKey("projects.id", ondelete="CASCADE"))
     config_id: Mapped[uuid.UUID] = mapped_column(GUID(), ForeignKey("train_configs.id", ondelete="SET NULL"))
     group_id: Mapped[Optional[uuid.UUID]] = mapped_column(GUID(), ForeignKey("experiment_groups.id", ondelete="SET NULL"))
     name: Mapped[str] = mapped_column(String(255), nullable=False)
-    state: Mapped[str] = mapped_column(String(20), default="queued")
+    state: Mapped[str] = mapped_column(InternedString(20), default="queued")
     monitor_metric: Mapped[Optional[str]] = mapped_column(String(50))
-    monitor_mode: Mapped[Optional[str]] = mapped_column(String(10))
+    monitor_mode: Mapped[Optional[str]] = mapped_column(InternedString(10))
     best_value: Mapped[Optional[float]] = mapped_column()
     epoch: Mapped[Optional[int]] = mapped_column(Integer)
     step: Mapped[Optional[int]] = mapped_column(Integer)
@@ -86,19 +88,26 @@ class Run(TimestampMixin, Base):
     seed: Mapped[Optional[int]] = mapped_column(Integer)
     log_dir: Mapped[Optional[str]] = mapped_column(String(512))
     ckpt_dir: Mapped[Optional[str]] = mapped_column(String(512))
-    gpu_indices: Mapped[Optional[list[int]]] = mapped_column(JSON)
+    gpu_indices: Mapped[Optional[list[int]]] = mapped_column(JSONType)
 
-    # Many-to-many relationship with tags
-    tags: Mapped[list["Tag"]] = relationship("Tag", secondary="training_run_tags", back_populates="runs")
+    # Many-to-many relationship with tags (selectin: one IN query per batch, no N+1)
+    tags: Mapped[list["Tag"]] = relationship("Tag", secondary="training_run_tags", back_populates="runs", lazy="selectin")
+
+    __table_args__ = (
+        Index("ix_runs_project_state", "project_id", "state"),
+        Index("ix_runs_group_created", "group_id", "created_at"),
+        Index("ix_runs_agent_state", "agent_id", "state"),
+        Index("ix_runs_config", "config_id"),
+    )
 
 
 class Job(TimestampMixin, Base):
     __tablename__ = "jobs"
 
-    id: Mapped[uuid.UUID] = mapped_column(GUID(), primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(GUID(), primary_key=True, default=uuid7)
     run_id: Mapped[uuid.UUID] = mapped_column(GUID(), ForeignKey("runs.id", ondelete="CASCADE"))
     queue_id: Mapped[Optional[str]] = mapped_column(String(64))
-    enqueued_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
+    enqueued_at: Mapped[datetime] = mapped_column(server_default=utcnow())
     dequeued_at: Mapped[Optional[datetime]] = mapped_column()
     retries: Mapped[int] = mapped_column(Integer, default=0)
     last_error: Mapped[Optional[str]] = mapped_column(Text)
@@ -108,21 +117,25 @@ class Job(TimestampMixin, Base):
 class Agent(TimestampMixin, Base):
     __tablename__ = "agents"
 
-    id: Mapped[uuid.UUID] = mapped_column(GUID(), primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(GUID(), primary_key=True, default=uuid7)
     name: Mapped[str] = mapped_column(String(255), unique=True)
     host: Mapped[Optional[str]] = mapped_column(String(255))
-    labels: Mapped[Optional[dict]] = mapped_column(JSON)
+    labels: Mapped[Optional[dict]] = mapped_column(JSONType)
     last_heartbeat_at: Mapped[Optional[datetime]] = mapped_column()
     api_version: Mapped[Optional[str]] = mapped_column(String(50))
     runner_version: Mapped[Optional[str]] = mapped_column(String(50))
 
     gpus: Mapped[list[GPU]] = relationship(back_populates="agent", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        Index("ix_agents_labels_gin", "labels", postgresql_using="gin").ddl_if(dialect="postgresql"),
+    )
+
 
 class GPU(TimestampMixin, Base):
     __tablename__ = "gpus"
 
-    id: Mapped[uuid.UUID] = mapped_column(GUID(), primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(GUID(), primary_key=True, default=uuid7)
     agent_id: Mapped[uuid.UUID] = mapped_column(GUID(), ForeignKey("agents.id", ondelete="CASCADE"))
     index: Mapped[int] = mapped_column(Integer)
     uuid: Mapped[Optional[str]] = mapped_column(String(64))
@@ -142,13 +155,13 @@ class GPU(TimestampMixin, Base):
 class Dataset(TimestampMixin, Base):
     __tablename__ = "datasets"
 
-    id: Mapped[uuid.UUID] = mapped_column(GUID(), primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(GUID(), primary_key=True, default=uuid7)
     project_id: Mapped[uuid.UUID] = mapped_column(GUID(), ForeignKey("projects.id", ondelete="CASCADE"))
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     root_path: Mapped[str] = mapped_column(String(1024), nullable=False)
-    split_layout: Mapped[dict | None] = mapped_column(JSON)
-    class_map: Mapped[dict | None] = mapped_column(JSON)
-    sample_stats: Mapped[dict | None] = mapped_column(JSON)
+    split_layout: Mapped[dict | None] = mapped_column(JSONType)
+    class_map: Mapped[dict | None] = mapped_column(JSONType)
+    sample_stats: Mapped[dict | None] = mapped_column(JSONType)
 
     __table_args__ = (
         Index("ix_dataset_project_name", "project_id", "name", unique=True),
@@ -158,7 +171,7 @@ class Dataset(TimestampMixin, Base):
 class ModelRegistry(TimestampMixin, Base):
     __tablename__ = "models"
 
-    id: Mapped[uuid.UUID] = mapped_column(GUID(), primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(GUID(), primary_key=True, default=uuid7)
     project_id: Mapped[uuid.UUID] = mapped_column(GUID(), ForeignKey("projects.id", ondelete="CASCADE"))
     label: Mapped[str] = mapped_column(String(255), nullable=False)
     hf_checkpoint_id: Mapped[str] = mapped_column(String(512), nullable=False)
@@ -175,11 +188,11 @@ class ModelRegistry(TimestampMixin, Base):
 class Augmentation(TimestampMixin, Base):
     __tablename__ = "augmentations"
 
-    id: Mapped[uuid.UUID] = mapped_column(GUID(), primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(GUID(), primary_key=True, default=uuid7)
     project_id: Mapped[uuid.UUID] = mapped_column(GUID(), ForeignKey("projects.id", ondelete="CASCADE"))
     name: Mapped[str] = mapped_column(String(255), nullable=False)
-    type: Mapped[str] = mapped_column(String(10), default="cpu")  # cpu|gpu
-    params: Mapped[dict | None] = mapped_column(JSON)
+    type: Mapped[str] = mapped_column(InternedString(10), default="cpu")  # cpu|gpu
+    params: Mapped[dict | None] = mapped_column(JSONType)
     enabled: Mapped[bool] = mapped_column(Boolean, default=True)
     version: Mapped[int] = mapped_column(Integer, default=1)
 
@@ -191,22 +204,33 @@ class Augmentation(TimestampMixin, Base):
 class RunLog(TimestampMixin, Base):
     __tablename__ = "run_logs"
 
-    id: Mapped[uuid.UUID] = mapped_column(GUID(), primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(GUID(), primary_key=True, default=uuid7)
     run_id: Mapped[uuid.UUID] = mapped_column(GUID(), ForeignKey("runs.id", ondelete="CASCADE"))
     timestamp: Mapped[datetime] = mapped_column(nullable=False)
-    level: Mapped[str] = mapped_column(String(10), default="info")  # debug, info, warning, error
-    source: Mapped[str] = mapped_column(String(20), default="agent")  # agent, executor, training
+    level: Mapped[str] = mapped_column(InternedString(10), default="info")  # debug, info, warning, error
+    source: Mapped[str] = mapped_column(InternedString(20), default="agent")  # agent, executor, training
     message: Mapped[str] = mapped_column(Text, nullable=False)
 
     __table_args__ = (
         Index("ix_run_logs_run_timestamp", "run_id", "timestamp"),
+        Index("ix_run_logs_run_level_ts", "run_id", "level", "timestamp"),
     )
 
 
+def bulk_insert_run_logs(session: Session, rows: list[dict]) -> None:
+    """Insert run log rows in one executemany, bypassing per-row ORM state.
+
+    Each row is a plain dict with run_id, timestamp, level, source and message;
+    id and timestamps are filled from the column defaults. Does not commit.
+    """
+    if rows:
+        session.execute(insert(RunLog), rows)
+
+
 class Tag(TimestampMixin, Base):
     __tablename__ = "tags"
 
-    id: Mapped[uuid.UUID] = mapped_column(GUID(), primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(GUID(), primary_key=True, default=uuid7)
     project_id: Mapped[uuid.UUID] = mapped_column(GUID(), ForeignKey("projects.id", ondelete="CASCADE"))
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     parent_id: Mapped[Optional[uuid.UUID]] = mapped_column(GUID(), ForeignKey("tags.id", ondelete="CASCADE"))
@@ -227,6 +251,8 @@ class Tag(TimestampMixin, Base):
         Index("ix_tags_project_id", "project_id"),
         Index("ix_tags_parent_id", "parent_id"),
         Index("ix_tags_path", "path"),
+        # Lets Postgres serve prefix LIKE scans regardless of collation
+        Index("ix_tags_path_prefix", "path", postgresql_ops={"path": "varchar_pattern_ops"}).ddl_if(dialect="postgresql"),
         Index("ix_tags_level", "level"),
         Index("ix_tags_name", "name"),
         Index("ix_tags_project_parent", "project_id", "parent_id"),
@@ -239,7 +265,7 @@ class TrainingRunTag(Base):
 
     training_run_id: Mapped[uuid.UUID] = mapped_column(GUID(), ForeignKey("runs.id", ondelete="CASCADE"), primary_key=True)
     tag_id: Mapped[uuid.UUID] = mapped_column(GUID(), ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True)
-    created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(server_default=utcnow())
 
     __table_args__ = (
         Index("ix_training_run_tags_run_id", "training_run_id"),
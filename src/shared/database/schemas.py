@@ -2,14 +2,75 @@ from __future__ import annotations
 
 from datetime import datetime
 from typing import Optional, List
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, SkipValidation, TypeAdapter
+from pydantic.dataclasses import dataclass
 from uuid import UUID
 
 # Import TrainConfig from core
 from core.config import TrainConfig
 
 
-class ProjectCreate(BaseModel):
+__all__ = [
+    "MODEL_CONFIG",
+    "OrmModel",
+    "ProjectCreate",
+    "ProjectUpdate",
+    "ProjectOut",
+    "GroupCreate",
+    "GroupOut",
+    "TrainConfigCreate",
+    "TrainConfigUpdate",
+    "TrainConfigOut",
+    "RunCreate",
+    "RunOut",
+    "AgentCreate",
+    "AgentOut",
+    "GPUCreate",
+    "GPUOut",
+    "DatasetCreate",
+    "DatasetOut",
+    "ModelCreate",
+    "ModelUpdate",
+    "ModelOut",
+    "ModelOutSafe",
+    "AugmentationCreate",
+    "AugmentationOut",
+    "TagCreate",
+    "TagUpdate",
+    "TagMove",
+    "TagOut",
+    "TagWithChildren",
+    "TagAncestry",
+    "TagStats",
+    "RunTagAssignment",
+    "RunWithTags",
+    "RUN_OUT_LIST_ADAPTER",
+    "CONFIG_OUT_LIST_ADAPTER",
+    "PROJECT_OUT_LIST_ADAPTER",
+]
+
+
+# Shared by every ORM-backed output DTO. defer_build postpones core-schema
+# construction until a model is first used, so DTOs an endpoint never touches
+# cost nothing at import.
+MODEL_CONFIG = ConfigDict(
+    from_attributes=True,
+    extra="ignore",
+    validate_assignment=False,
+    arbitrary_types_allowed=False,
+    defer_build=True,
+)
+
+
+class OrmModel(BaseModel):
+    """Base for output DTOs that are read straight from ORM rows."""
+    model_config = MODEL_CONFIG
+
+
+# Plain request bodies that are read once and never mutated or re-dumped are
+# slotted, frozen pydantic dataclasses: same validation, lighter instances.
+@dataclass(slots=True, frozen=True)
+class ProjectCreate:
     name: str
     description: Optional[str] = None
 
@@ -19,25 +80,23 @@ class ProjectUpdate(BaseModel):
     description: Optional[str] = None
 
 
-class ProjectOut(BaseModel):
+class ProjectOut(OrmModel):
     id: UUID
     name: str
     description: Optional[str]
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
 
-
-class GroupCreate(BaseModel):
+@dataclass(slots=True, frozen=True)
+class GroupCreate:
     project_id: str
     name: str
     description: Optional[str] = None
-    tags: Optional[List[str]] = Field(default_factory=list)
+    tags: Optional[tuple[str, ...]] = ()
 
 
-class GroupOut(BaseModel):
+class GroupOut(OrmModel):
     id: UUID
     project_id: UUID
     name: str
@@ -46,9 +105,6 @@ class GroupOut(BaseModel):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
-
 
 # TrainConfigIn removed - using core.config.TrainConfig directly
 
@@ -66,34 +122,33 @@ class TrainConfigUpdate(BaseModel):
     config_json: Optional[TrainConfig] = None
 
 
-class TrainConfigOut(BaseModel):
+class TrainConfigOut(OrmModel):
     id: UUID
     project_id: UUID
     group_id: Optional[UUID]
     name: str
-    config_json: dict
+    # Stored configs were validated as TrainConfig on write; pass them through.
+    config_json: SkipValidation[dict]
     version: int
     status: str
     hash: Optional[str]
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
 
-
-class RunCreate(BaseModel):
+@dataclass(slots=True, frozen=True)
+class RunCreate:
     agent_id: Optional[str] = None
-    gpu_indices: List[int] = Field(default_factory=list)
+    gpu_indices: tuple[int, ...] = ()
     docker_image: Optional[str] = None
     env: Optional[dict] = None
     priority: int = 0
 
 
-class RunOut(BaseModel):
+class RunOut(OrmModel):
     id: UUID
     project_id: UUID
-    config_id: UUID
+    config_id: Optional[UUID]  # SET NULL when the config is deleted
     group_id: Optional[UUID]
     name: str
     state: str
@@ -112,17 +167,15 @@ class RunOut(BaseModel):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
-
 
-class AgentCreate(BaseModel):
+@dataclass(slots=True, frozen=True)
+class AgentCreate:
     name: str
     host: Optional[str] = None
     labels: Optional[dict] = None
 
 
-class AgentOut(BaseModel):
+class AgentOut(OrmModel):
     id: UUID
     name: str
     host: Optional[str]
@@ -130,11 +183,9 @@ class AgentOut(BaseModel):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
 
-
-class GPUCreate(BaseModel):
+@dataclass(slots=True, frozen=True)
+class GPUCreate:
     agent_id: str
     index: int
     uuid: Optional[str] = None
@@ -143,7 +194,7 @@ class GPUCreate(BaseModel):
     compute_capability: Optional[str] = None
 
 
-class GPUOut(BaseModel):
+class GPUOut(OrmModel):
     id: UUID
     agent_id: UUID
     index: int
@@ -155,12 +206,10 @@ class GPUOut(BaseModel):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
-
 
 # Datasets
-class DatasetCreate(BaseModel):
+@dataclass(slots=True, frozen=True)
+class DatasetCreate:
     name: str
     root_path: str
     split_layout: dict | None = None
@@ -168,7 +217,7 @@ class DatasetCreate(BaseModel):
     sample_stats: dict | None = None
 
 
-class DatasetOut(BaseModel):
+class DatasetOut(OrmModel):
     id: UUID
     project_id: UUID
     name: str
@@ -179,12 +228,10 @@ class DatasetOut(BaseModel):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
-
 
 # Models registry
-class ModelCreate(BaseModel):
+@dataclass(slots=True, frozen=True)
+class ModelCreate:
     label: str
     hf_checkpoint_id: str
     hf_token: str | None = None
@@ -200,7 +247,7 @@ class ModelUpdate(BaseModel):
     default_pretrained: bool | None = None
 
 
-class ModelOut(BaseModel):
+class ModelOut(OrmModel):
     id: UUID
     project_id: UUID
     label: str
@@ -211,11 +258,8 @@ class ModelOut(BaseModel):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
 
-
-class ModelOutSafe(BaseModel):
+class ModelOutSafe(OrmModel):
     """Model output without sensitive HF token for frontend"""
     id: UUID
     project_id: UUID
@@ -227,12 +271,10 @@ class ModelOutSafe(BaseModel):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
-
 
 # Augmentations
-class AugmentationCreate(BaseModel):
+@dataclass(slots=True, frozen=True)
+class AugmentationCreate:
     name: str
     type: str = "cpu"  # cpu|gpu
     params: dict | None = None
@@ -240,7 +282,7 @@ class AugmentationCreate(BaseModel):
     version: int = 1
 
 
-class AugmentationOut(BaseModel):
+class AugmentationOut(OrmModel):
     id: UUID
     project_id: UUID
     name: str
@@ -251,12 +293,10 @@ class AugmentationOut(BaseModel):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
-
 
 # Tags
-class TagCreate(BaseModel):
+@dataclass(slots=True, frozen=True)
+class TagCreate:
     project_id: UUID
     name: str
     parent_id: Optional[UUID] = None
@@ -270,7 +310,7 @@ class TagMove(BaseModel):
     new_parent_id: Optional[UUID] = None
 
 
-class TagOut(BaseModel):
+class TagOut(OrmModel):
     id: UUID
     project_id: UUID
     name: str
@@ -280,16 +320,11 @@ class TagOut(BaseModel):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
-
 
 class TagWithChildren(TagOut):
+    # Self-reference is resolved lazily on first use (defer_build via TagOut)
     children: List["TagWithChildren"] = []
 
-# Update forward references
-TagWithChildren.model_rebuild()
-
 
 class TagAncestry(BaseModel):
     tags: List[TagOut]
@@ -309,3 +344,9 @@ class RunTagAssignment(BaseModel):
 
 class RunWithTags(RunOut):
     tags: List[TagOut] = []
+
+
+# Adapters built once at import for the hot list endpoints
+RUN_OUT_LIST_ADAPTER = TypeAdapter(List[RunOut])
+CONFIG_OUT_LIST_ADAPTER = TypeAdapter(List[TrainConfigOut])
+PROJECT_OUT_LIST_ADAPTER = TypeAdapter(List[ProjectOut])
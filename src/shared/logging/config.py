@@ -5,13 +5,42 @@ This module provides a centralized logging setup that can be used across all ser
 (dashboard, agent, core) with environment-based configuration for production and development.
 """
 
+import atexit
+import copy
 import logging
 import logging.config
+import logging.handlers
 import os
+import queue
 import sys
 from typing import Optional
 
 
+# Services already configured in this process; dictConfig is not re-run for them
+_CONFIGURED: set[str] = set()
+
+_FORMATTERS = {
+    'standard': {
+        'format': '%(asctime)s [%(levelname)s] %(name)s: %(message)s',
+        'datefmt': '%Y-%m-%d %H:%M:%S'
+    },
+    'detailed': {
+        'format': '%(asctime)s [%(levelname)s] %(name)s:%(lineno)d: %(message)s',
+        'datefmt': '%Y-%m-%d %H:%M:%S'
+    },
+    'simple': {
+        'format': '[%(levelname)s] %(name)s: %(message)s'
+    }
+}
+
+# Reduce noise from external libraries
+_QUIET_LOGGERS = ('urllib3', 'requests', 'transformers')
+
+# Background listeners draining service log queues; referenced here so they
+# stay alive, and stopped (flushing pending records) at interpreter exit
+_LISTENERS: list[logging.handlers.QueueListener] = []
+
+
 def setup_logging(
     service_name: str,
     log_level: Optional[str] = None,
@@ -21,6 +50,9 @@ def setup_logging(
     """
     Configure structured logging for a service.
 
+    Repeated calls for an already configured service return its logger
+    without re-running dictConfig.
+
     Args:
         service_name: Name of the service (e.g., "dashboard", "agent", "core")
         log_level: Override log level (defaults to env var or INFO)
@@ -30,6 +62,9 @@ def setup_logging(
     Returns:
         Configured logger instance for the service
     """
+    if service_name in _CONFIGURED:
+        return logging.getLogger(service_name)
+
     # Determine log level from environment or parameter
     if log_level is None:
         log_level = os.getenv("LOG_LEVEL", "INFO").upper()
@@ -42,21 +77,6 @@ def setup_logging(
     if enable_file_logging:
         os.makedirs(log_dir, exist_ok=True)
 
-    # Configure formatters
-    formatters = {
-        'standard': {
-            'format': '%(asctime)s [%(levelname)s] %(name)s: %(message)s',
-            'datefmt': '%Y-%m-%d %H:%M:%S'
-        },
-        'detailed': {
-            'format': '%(asctime)s [%(levelname)s] %(name)s:%(lineno)d: %(message)s',
-            'datefmt': '%Y-%m-%d %H:%M:%S'
-        },
-        'simple': {
-            'format': '[%(levelname)s] %(name)s: %(message)s'
-        }
-    }
-
     # Configure handlers
     handlers = {
         'console': {
@@ -67,10 +87,10 @@ def setup_logging(
         }
     }
 
-    # Add file handler if enabled
+    # Add file handler if enabled; the factory form skips dictConfig's import lookup
     if enable_file_logging:
         handlers['file'] = {
-            'class': 'logging.handlers.RotatingFileHandler',
+            '()': logging.handlers.RotatingFileHandler,
             'level': 'DEBUG',
             'formatter': 'detailed',
             'filename': os.path.join(log_dir, f'{service_name}.log'),
@@ -79,35 +99,23 @@ def setup_logging(
             'encoding': 'utf-8'
         }
 
-    # Build logging configuration
+    loggers = {
+        service_name: {
+            'level': 'DEBUG',
+            'handlers': ['console'] + (['file'] if enable_file_logging else []),
+            'propagate': False
+        },
+    }
+    for name in _QUIET_LOGGERS:
+        loggers[name] = {'level': 'WARNING', 'handlers': ['console'], 'propagate': False}
+
+    # Build logging configuration (dictConfig consumes it, so shared parts are copied)
     config = {
         'version': 1,
         'disable_existing_loggers': False,
-        'formatters': formatters,
+        'formatters': copy.deepcopy(_FORMATTERS),
         'handlers': handlers,
-        'loggers': {
-            service_name: {
-                'level': 'DEBUG',
-                'handlers': ['console'] + (['file'] if enable_file_logging else []),
-                'propagate': False
-            },
-            # Reduce noise from external libraries
-            'urllib3': {
-                'level': 'WARNING',
-                'handlers': ['console'],
-                'propagate': False
-            },
-            'requests': {
-                'level': 'WARNING',
-                'handlers': ['console'],
-                'propagate': False
-            },
-            'transformers': {
-                'level': 'WARNING',
-                'handlers': ['console'],
-                'propagate': False
-            }
-        },
+        'loggers': loggers,
         'root': {
             'level': 'INFO',
             'handlers': ['console']
@@ -116,14 +124,48 @@ def setup_logging(
 
     # Apply configuration
     logging.config.dictConfig(config)
+    _CONFIGURED.add(service_name)
 
     # Return service-specific logger
     logger = logging.getLogger(service_name)
+    _move_handlers_to_listener(logger)
     logger.info(f"Logging initialized for {service_name} (level: {log_level})")
 
     return logger
 
 
+def _move_handlers_to_listener(logger: logging.Logger) -> None:
+    """
+    Hand the logger's handlers to a background QueueListener.
+
+    The logger keeps a single QueueHandler, so callers only enqueue records
+    while formatting, file writes and rotation happen on the listener thread.
+
+    Args:
+        logger: Logger whose handlers should be moved off the calling thread
+    """
+    handlers = list(logger.handlers)
+    if not handlers:
+        return
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    for handler in handlers:
+        logger.removeHandler(handler)
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+
+    listener.start()
+    _LISTENERS.append(listener)
+
+
+def _stop_listeners() -> None:
+    while _LISTENERS:
+        _LISTENERS.pop().stop()
+
+
+atexit.register(_stop_listeners)
+
+
 def get_logger(name: str) -> logging.Logger:
     """
     Get a logger instance with the given name.